@@ -1,20 +1,14 @@
 import os
+import re
 from io import BytesIO
 from urllib.parse import urlencode
 from datetime import datetime
+from functools import lru_cache
 
 import streamlit as st
-from PyPDF2 import PdfReader
-from docx import Document
-from pptx import Presentation
-
-# PDF (install: pip install reportlab)
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+
+# Document parsers/writers (pypdf, python-docx, python-pptx, reportlab) are imported
+# inside the helpers that use them so pages that never touch files start faster.
 
 # your modules
 import app.pages as pages
@@ -25,8 +19,10 @@ from pages import reader as reader_page
 from pages import outputs as outputs_page
 from pages import settings as settings_page
 
-st.set_page_config(page_title="Style Suite", layout="wide")
-st.markdown("""
+# ----------------------- Styles --------------------------
+# Kept at module level; Streamlit drops elements that are not re-emitted on a
+# rerun, so the markdown call itself still has to run every time.
+_SIDEBAR_CSS = """
 <style>
 [data-testid="stSidebar"] .block-container{
   padding: -8px -12px 20px -12px !important;  /* top, right, bottom, left */
@@ -129,7 +125,23 @@ st.markdown("""
   margin-top: 2px !important;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+_CHAINLIT_CSS = """
+<style>
+/* Add some top padding and remove extra margins */
+.chainlit-frame-container {
+    padding-top: 18px;     /* 👈 Adjust this value (e.g. 12–24px) */
+}
+iframe[title="chainlit"] {
+    border: none !important;
+    border-radius: 8px;
+}
+</style>
+"""
+
+st.set_page_config(page_title="Style Suite", layout="wide")
+st.markdown(_SIDEBAR_CSS, unsafe_allow_html=True)
 pages.show_home()  # keep your existing header/banner etc.
 st.session_state.setdefault("nav", "writer/style-writer")  # default route
 st.session_state.setdefault("content", "")
@@ -175,8 +187,15 @@ def show_outputs():
 
 
 # ----------------------- Helpers -------------------------
+@lru_cache(maxsize=None)
 def _register_pdf_font_if_available():
+    # Font path is fixed for the process lifetime, so this resolves only once
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
     try:
+        if "DejaVuSans" in pdfmetrics.getRegisteredFontNames():
+            return "DejaVuSans"
         font_path = os.path.join("assets", "DejaVuSans.ttf")
         if os.path.exists(font_path):
             pdfmetrics.registerFont(TTFont("DejaVuSans", font_path))
@@ -185,21 +204,31 @@ def _register_pdf_font_if_available():
         pass
     return "Helvetica"
 
+# Escapes ReportLab paragraph markup and keeps line breaks, in one pass
+_PDF_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", "\n": "<br/>"})
+
+# The exporters return BytesIO.getvalue() directly: CPython hands back the internal
+# buffer without copying once writing is done, which pre-sizing or getbuffer() can't beat.
 def make_docx_bytes(text: str, title: str | None = None) -> bytes:
+    from docx import Document
+
     doc = Document()
     if title:
         doc.add_heading(title, level=1)
     for block in text.replace("\r\n", "\n").split("\n\n"):
-        p = doc.add_paragraph()
-        for line in block.split("\n"):
-            if line.strip():
-                p.add_run(line)
-            p.add_run("\n")
+        # One run per block; python-docx turns the newlines into line breaks
+        doc.add_paragraph("\n".join(line for line in block.split("\n") if line.strip()))
     bio = BytesIO()
     doc.save(bio)
     return bio.getvalue()
 
 def make_pdf_bytes(text: str, title: str | None = None) -> bytes:
+    # PDF (install: pip install reportlab)
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+
     font_name = _register_pdf_font_if_available()
     buf = BytesIO()
     doc = SimpleDocTemplate(
@@ -214,11 +243,70 @@ def make_pdf_bytes(text: str, title: str | None = None) -> bytes:
     if title:
         story.append(Paragraph(title, title_style)); story.append(Spacer(1, 8))
     for block in text.replace("\r\n", "\n").split("\n\n"):
-        block = block.replace("&","&amp;").replace("<","&lt;").replace(">","&gt;").replace("\n","<br/>")
+        block = block.translate(_PDF_ESCAPE)
         story.append(Paragraph(block, base)); story.append(Spacer(1, 6))
     doc.build(story)
     return buf.getvalue()
 
+@st.cache_data(show_spinner=False, ttl=3600)
+def _cached_rewrite(content: str, style: str, example: str, guidelines: str) -> str:
+    # Keyed on every prompt input, so an identical re-click doesn't call the model again
+    return prompts.rewrite_content(
+        content, False, style=style, guidelines=guidelines, example=example
+    )
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _export_bytes(text: str, title: str | None, fmt: str) -> bytes:
+    # Memoized on text/title/format, so reruns don't render the same document again
+    if fmt == "pdf":
+        return make_pdf_bytes(text, title=title)
+    return make_docx_bytes(text, title=title)
+
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7f]+")
+
+def _strip_non_ascii(text: str) -> str:
+    # Single pass without the bytes round-trip; pure-ASCII text is returned as-is
+    return text if text.isascii() else _NON_ASCII_RE.sub("", text)
+
+def _extract_pdf(src) -> str:
+    from pypdf import PdfReader
+    pdf_reader = PdfReader(src)
+    return "\n".join(page.extract_text() or "" for page in pdf_reader.pages)
+
+def _extract_docx(src) -> str:
+    from docx import Document
+    doc = Document(src)
+    # .text walks every run, so read it once per paragraph
+    texts = [paragraph.text for paragraph in doc.paragraphs]
+    return "\n".join(t for t in texts if t.strip())
+
+def _extract_pptx(src) -> str:
+    from pptx import Presentation
+    prs = Presentation(src)
+    parts = []
+    for slide in prs.slides:
+        for shape in slide.shapes:
+            txt = getattr(shape, "text", "")
+            if txt and txt.strip():
+                parts.append(txt)
+    return "\n".join(parts)
+
+_EXTRACTORS = {"pdf": _extract_pdf, "docx": _extract_docx, "pptx": _extract_pptx}
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _extract_upload_text(file_bytes: bytes, kind: str) -> str:
+    # Keyed on the upload bytes, so reruns don't re-parse the same file
+    extractor = _EXTRACTORS.get(kind)
+    return extractor(BytesIO(file_bytes)) if extractor else ""
+
+def _split_guidelines(guidelines: dict):
+    # Two checkbox columns as (section_name, content, widget_key) triples
+    items = list(guidelines.items()); mid = len(items) // 2
+    return (
+        [(name, content, f"col1_{name}") for name, content in items[:mid]],
+        [(name, content, f"col2_{name}") for name, content in items[mid:]],
+    )
+
 # ----------------------- Views ---------------------------
 # def show_chainlit():
 #     # Build Chainlit URL (append your own auth token if you have SSO)
@@ -228,30 +316,13 @@ def make_pdf_bytes(text: str, title: str | None = None) -> bytes:
 #     st.components.v1.iframe(url, height=600)
 
 def show_chainlit():
-    from urllib.parse import urlencode
-    import streamlit as st
-
     # Build Chainlit URL
     params = {"user": st.session_state.get("user_id", "demo")}
     CHAINLIT_BASE = "https://miniature-funicular-g4v7546vvr54cg6g-8000.app.github.dev"
     url = f"{CHAINLIT_BASE}?{urlencode(params)}"
 
     # Add padding to the iframe container
-    st.markdown(
-        """
-        <style>
-        /* Add some top padding and remove extra margins */
-        .chainlit-frame-container {
-            padding-top: 18px;     /* 👈 Adjust this value (e.g. 12–24px) */
-        }
-        iframe[title="chainlit"] {
-            border: none !important;
-            border-radius: 8px;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
+    st.markdown(_CHAINLIT_CSS, unsafe_allow_html=True)
 
     # Display iframe inside padded container
     st.markdown('<div class="chainlit-frame-container">', unsafe_allow_html=True)
@@ -276,30 +347,18 @@ def show_style_writer():
     )
 
     # Extract text from uploads
-    extracted_text = ""
+    parts = []
     if uploaded_files:
-        for uploaded_file in uploaded_files:
-            file_type = uploaded_file.name.split(".")[-1].lower()
-            if file_type == "pdf":
-                pdf_reader = PdfReader(BytesIO(uploaded_file.read()))
-                for page in pdf_reader.pages:
-                    extracted_text += page.extract_text() + "\n"
-            elif file_type == "docx":
-                doc = Document(BytesIO(uploaded_file.read()))
-                for paragraph in doc.paragraphs:
-                    if paragraph.text.strip():
-                        extracted_text += paragraph.text + "\n"
-            elif file_type == "pptx":
-                prs = Presentation(BytesIO(uploaded_file.read()))
-                for slide in prs.slides:
-                    for shape in slide.shapes:
-                        if hasattr(shape, "text") and shape.text.strip():
-                            extracted_text += shape.text + "\n"
+        for uf in uploaded_files:
+            text = _extract_upload_text(uf.getvalue(), uf.name.split(".")[-1].lower())
+            if text:
+                parts.append(text)
+    extracted_text = "\n".join(parts)
 
     content_all = (
         st.session_state.content
         + "\n"
-        + extracted_text.encode("ascii", errors="ignore").decode("ascii")
+        + _strip_non_ascii(extracted_text)
     )
 
     # Styles
@@ -321,25 +380,27 @@ def show_style_writer():
 
     st.write(":blue[**Select Editorial Style Guides:**]")
 
-    def render_guideline_checkbox(section_name: str, content: str, col_key_prefix: str):
+    def render_guideline_checkbox(section_name: str, content: str, key: str):
         default_checked = section_name in ["COMMON GRAMMATICAL ERRORS", "WRITING LETTERS"]
         tooltip = guidelines_summary.get(section_name, None)
-        if st.checkbox(
-            section_name, value=default_checked,
-            key=f"{col_key_prefix}_{section_name}", help=tooltip
-        ):
+        if st.checkbox(section_name, value=default_checked, key=key, help=tooltip):
             selected_guidelines.append(content)
 
     if guidelines:
+        # Split once per session; the guidelines dict only changes with the local data
+        split = st.session_state.get("_guideline_columns")
+        if split is None or split[0] is not guidelines:
+            split = (guidelines, _split_guidelines(guidelines))
+            st.session_state["_guideline_columns"] = split
+        left, right = split[1]
         with st.container(border=True):
             col1, col2 = st.columns(2)
-            items = list(guidelines.items()); mid = len(items) // 2
             with col1:
-                for section_name, content in items[:mid]:
-                    render_guideline_checkbox(section_name, content, "col1")
+                for section_name, content, key in left:
+                    render_guideline_checkbox(section_name, content, key)
             with col2:
-                for section_name, content in items[mid:]:
-                    render_guideline_checkbox(section_name, content, "col2")
+                for section_name, content, key in right:
+                    render_guideline_checkbox(section_name, content, key)
     else:
         st.warning("No guidelines available in the local data.")
 
@@ -350,12 +411,26 @@ def show_style_writer():
     # duplicating behavior we keep that logic on the web frontend only.
 
     # Rewrite button
+    _rewrite_fragment(content_all)
+
+
+@st.fragment
+def _rewrite_fragment(content_all: str):
+    # Reruns on its own when its buttons are clicked, without re-running the page
     disabled = (content_all == "" or st.session_state.style == "" or st.session_state.example == "")
     if st.button(":blue[**Rewrite Content**]", key="extract", disabled=disabled):
         with st.container(border=True):
             with st.spinner("Processing..."):
                 st.markdown("### ✨ Rewritten Output")
-                output = prompts.rewrite_content(content_all, False)
+                output = _cached_rewrite(
+                    content_all,
+                    st.session_state.style,
+                    st.session_state.example,
+                    st.session_state.guidelines,
+                )
+                if output is None:
+                    # utils.chat already reported the error; don't keep it cached
+                    _cached_rewrite.clear()
                 utils.save_output(output, content_all)
 
                 st.session_state["last_output"] = output
@@ -364,20 +439,20 @@ def show_style_writer():
                 base_name = f"rewrite_{style_id}_{ts}"
 
                 title_text = f"Rewrite • {st.session_state.get('styleId') or 'Selected Style'}"
-                docx_bytes = make_docx_bytes(output, title=title_text)
-                pdf_bytes = make_pdf_bytes(output, title=title_text)
 
                 c1, c2 = st.columns(2)
                 with c1:
                     st.download_button(
-                        "⬇️ Download as DOCX", data=docx_bytes,
+                        "⬇️ Download as DOCX",
+                        data=_export_bytes(output, title_text, "docx"),
                         file_name=f"{base_name}.docx",
                         mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
                         use_container_width=True,
                     )
                 with c2:
                     st.download_button(
-                        "⬇️ Download as PDF", data=pdf_bytes,
+                        "⬇️ Download as PDF",
+                        data=_export_bytes(output, title_text, "pdf"),
                         file_name=f"{base_name}.pdf", mime="application/pdf",
                         use_container_width=True,
                     )
@@ -40,7 +40,7 @@ def show_home():
     if "exampleText" not in st.session_state:
         st.session_state.exampleText = ""
     if "locals" not in st.session_state:
-        st.session_state.locals = utils.read_json("data/local_data.json")
+        st.session_state.locals = utils.read_json_cached("data/local_data.json")
 
     # --- CSS tweaks (optional) ---
     st.markdown(
@@ -15,12 +15,21 @@ def extract_style(combined_text, debug):
     return utils.chat(messages, 0)
 
 
-def rewrite_content(content_all, debug):
+def rewrite_content(content_all, debug, style=None, guidelines=None, example=None):
+    # style/guidelines/example default to the session values; pass them explicitly
+    # when the call is cached so every input is part of the cache key
+    if style is None:
+        style = st.session_state.style
+    if guidelines is None:
+        guidelines = st.session_state.guidelines
+    if example is None:
+        example = st.session_state.example
+
     system = [
         "You are an expert writer assistant. Rewrite the user input based on the following writing style, writing guidelines and writing example.\n",
-        f"<writingStyle>{st.session_state.style}</writingStyle>\n",
-        f"<writingGuidelines>{st.session_state.guidelines}</writingGuidelines>\n",
-        f"<writingExample>{st.session_state.example}</writingExample>\n",
+        f"<writingStyle>{style}</writingStyle>\n",
+        f"<writingGuidelines>{guidelines}</writingGuidelines>\n",
+        f"<writingExample>{example}</writingExample>\n",
         "Make sure to emulate the writing style, guidelines and example provided above.",
     ]
 
@@ -135,6 +135,24 @@ def read_json(file_path):
         return None
 
 
+# Function to read a JSON file once per process (cached across reruns)
+@st.cache_data(show_spinner=False)
+def read_json_cached(file_path):
+    return read_json(file_path)
+
+
+# query styles for a user (cached across reruns; cleared on save/delete)
+@st.cache_data(ttl=3600, show_spinner=False)
+def query_styles(user_id):
+    query = "SELECT * FROM c WHERE c.user_id = @user_id"
+    parameters = [{"name": "@user_id", "value": user_id}]
+    return list(styles_container.query_items(
+        query=query,
+        parameters=parameters,
+        enable_cross_partition_query=True
+    ))
+
+
 # get styles from database
 def get_styles():
     try:
@@ -147,14 +165,7 @@ def get_styles():
             return []
             
         # Query items for the current user
-        query = "SELECT * FROM c WHERE c.user_id = @user_id"
-        parameters = [{"name": "@user_id", "value": user_id}]
-        items = list(styles_container.query_items(
-            query=query,
-            parameters=parameters,
-            enable_cross_partition_query=True
-        ))
-        return items
+        return query_styles(user_id)
     except exceptions.CosmosHttpResponseError as e:
         st.error(f"An error occurred while fetching styles: {e}")
         return []
@@ -206,6 +217,7 @@ def save_style(style, combined_text):
             "user_name": user_name
         }
         styles_container.create_item(body=new_style)
+        query_styles.clear()
     except exceptions.CosmosHttpResponseError as e:
         st.error(f"An error occurred while saving style: {e}")
 
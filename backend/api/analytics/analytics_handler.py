@@ -9,14 +9,20 @@ Backend analytics handler (Django-safe)
 """
 
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 import json
 import logging
+import os
+import re
+import threading
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
 
-from .chart_generator import ChartGenerator
-from .insight_generator import InsightGenerator
+from .chart_generator import chart_generator
+from .insight_generator import InsightGenerator, calculate_statistics
 
 try:
     from .services.foundry_service import FoundryService  # type: ignore
@@ -25,6 +31,103 @@ except Exception:  # optional
 
 logger = logging.getLogger(__name__)
 
+# Shared pool for building independent chart figures concurrently
+_CHART_POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4), thread_name_prefix="analytics-chart")
+# Separate pool so insights overlap chart rendering without competing for chart workers
+_INSIGHT_POOL = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 2), thread_name_prefix="analytics-insight")
+
+
+# Prompt keywords that imply a SQL-like transform (plain substring matches, as before)
+_SQL_KEYWORDS = [
+    # Filtering
+    "filter", "where", "only", "exclude", "select",
+    "specific", "particular", "certain",
+    # Aggregation
+    "sum", "total", "average", "mean", "count",
+    "group by", "grouped", "aggregate", "aggregated",
+    "per", "by category", "by type", "by group",
+    # Date/Time filtering
+    "year", "month", "date", "period", "between",
+    "since", "until", "before", "after", "during",
+    # Sorting/Limiting
+    "top", "bottom", "highest", "lowest", "first",
+    "last", "sort", "order", "rank",
+    # Calculations
+    "calculate", "compute", "derive", "maximum",
+    "minimum", "median", "percentile",
+]
+# One alternation scans the prompt once instead of one substring search per keyword
+_SQL_KEYWORD_RE = re.compile("|".join(map(re.escape, _SQL_KEYWORDS)), re.IGNORECASE)
+_YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+_TOP_N_RE = re.compile(r"top\s+(\d{1,3})")
+
+# Process-wide LRU of LLM chart recommendations. Handlers are built per request, so
+# this lives at module level; keyed on agent + prompt + column names/dtypes.
+_LLM_REC_CACHE: "OrderedDict[tuple, List[Dict[str, Any]]]" = OrderedDict()
+_LLM_REC_CACHE_MAX = 128
+_LLM_REC_CACHE_LOCK = threading.Lock()
+
+# LLM prompt preview: columns described, and rows scanned for samples/distinct counts
+_PREVIEW_MAX_COLS = 20
+_PREVIEW_SCAN_ROWS = 10_000
+
+# Chart types accepted from LLM recommendations
+_ALLOWED_CHART_TYPES = frozenset({"line", "bar", "scatter", "area", "pie", "histogram", "box", "heatmap"})
+
+# Identifier-like words in a lower-cased prompt (also used to test column names)
+_PROMPT_TOKEN_RE = re.compile(r"[a-z_][a-z0-9_]*")
+
+# Digits-separator-digits (2024-01-05, 1/5/24), month names, or compact 20240105
+_DATE_HINT_RE = re.compile(
+    r"\d{1,4}[-/.]\d{1,2}|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\b|^\d{8}$",
+    re.IGNORECASE,
+)
+
+# Phrases that name an explicit chart type, compiled once per type
+_CHART_PATTERNS: Dict[str, List[str]] = {
+    "line": ["line chart", "line graph", "trend line", "time series"],
+    "bar": ["bar chart", "bar graph", "column chart", "vertical bar"],
+    "scatter": ["scatter plot", "scatter chart", "scatterplot", "point plot"],
+    "pie": ["pie chart", "pie graph", "donut chart"],
+    "histogram": ["histogram", "distribution chart", "frequency chart"],
+    "box": ["box plot", "boxplot", "box and whisker"],
+    "heatmap": ["heatmap", "heat map", "correlation matrix"],
+    "area": ["area chart", "area graph", "filled line"],
+    "funnel": ["funnel chart", "funnel graph"],
+    "waterfall": ["waterfall chart", "waterfall graph"],
+}
+_CHART_TYPE_RES: Dict[str, re.Pattern] = {
+    ctype: re.compile("|".join(map(re.escape, pats)), re.IGNORECASE)
+    for ctype, pats in _CHART_PATTERNS.items()
+}
+# Union of every phrase above: one scan rules out prompts that name no chart at all
+_ANY_CHART_RE = re.compile(
+    "|".join(re.escape(p) for pats in _CHART_PATTERNS.values() for p in pats), re.IGNORECASE
+)
+
+
+def _rolling_mean(y: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """Trailing NaN-aware rolling mean (same semantics as Series.rolling(window, min_periods).mean())."""
+    valid = ~np.isnan(y)
+    csum = np.concatenate(([0.0], np.cumsum(np.where(valid, y, 0.0))))
+    ccnt = np.concatenate(([0], np.cumsum(valid)))
+    hi = np.arange(1, len(y) + 1)
+    lo = np.maximum(hi - window, 0)
+    sums = csum[hi] - csum[lo]
+    counts = ccnt[hi] - ccnt[lo]
+    out = np.full(len(y), np.nan)
+    np.divide(sums, counts, out=out, where=counts >= min_periods)
+    return out
+
+
+@dataclass
+class SchemaInfo:
+    """Column classification for one frame, computed once per request."""
+    numeric_cols: List[str]
+    categorical_cols: List[str]
+    datetime_cols: List[str]
+    lower_to_orig: Dict[str, str]
+
 
 class AnalyticsHandler:
     """
@@ -46,7 +149,7 @@ class AnalyticsHandler:
     """
 
     def __init__(self, sql_agent: Optional[Any] = None, foundry: Any = None):
-        self.chart_gen = ChartGenerator()
+        self.chart_gen = chart_generator
         self.insight_gen = InsightGenerator()
         self.sql_agent = sql_agent  # Optional
         self.foundry = foundry  # Optional FoundryService instance
@@ -109,25 +212,30 @@ class AnalyticsHandler:
                     logger.warning("SQL transformation error; continuing with original data.")
 
             provider = (params or {}).get("provider")
+            # Classify columns once for every helper below
+            schema = self._build_schema(df)
             # 1) Explicit chart requests from the prompt
-            explicit_charts = self._extract_explicit_chart_requests(user_prompt, df)
+            explicit_charts = self._extract_explicit_chart_requests(user_prompt, df, schema)
             picked_charts: List[Dict[str, Any]] = []
             if explicit_charts:
                 picked_charts = explicit_charts
                 results["chart_source"] = "explicit"
             else:
                 # 1b) LLM-driven recs if enabled
-                llm_specs = self._try_llm_chart_recommendations(df, user_prompt, provider)
+                llm_specs = self._try_llm_chart_recommendations(df, user_prompt, provider, schema)
                 if llm_specs:
                     picked_charts = llm_specs
                     results["chart_source"] = "llm"
                 else:
                     # 2) Deterministic default charts (no LLM)
-                    picked_charts = self._get_default_charts(df)
+                    picked_charts = self._get_default_charts(df, schema)
                     results["chart_source"] = "default"
 
+            # Insights only depend on df, so start them now and overlap with chart rendering
+            insights_future = _INSIGHT_POOL.submit(self._generate_insights, df, user_prompt, params, schema)
+
             # 2.5) Semantic aggregations for common asks (e.g., "top 10 customers by purchases")
-            agg_payload = self._maybe_apply_common_aggregation(df, user_prompt)
+            agg_payload = self._maybe_apply_common_aggregation(df, user_prompt, schema)
             if agg_payload is not None:
                 # Replace df with aggregated view for downstream visuals specific to this task
                 df_agg = agg_payload["data"]
@@ -150,13 +258,12 @@ class AnalyticsHandler:
                 results["charts"] = charts_result
                 results["chart_source"] = "aggregation"
                 # Tables: top-N records and statistics on totals
-                from .insight_generator import calculate_statistics
-                stats = calculate_statistics(df_agg.select_dtypes(include=["number"]))
+                stats = calculate_statistics(df_agg)  # selects numeric columns itself
                 results["tables"] = {
                     "top_n": {
                         "title": top_title,
-                        "columns": df_agg.columns.tolist(),
-                        "rows": df_agg.to_dict(orient="records"),
+                        "columns": list(df_agg.columns),
+                        "rows": self._to_records(df_agg),
                         "note": agg_payload.get("note", ""),
                     },
                     "statistics": stats,
@@ -166,8 +273,7 @@ class AnalyticsHandler:
                 results["charts"] = charts_result
 
             # 3) Insights (stats + narrative fallback)
-            insights_result = self._generate_insights(df, user_prompt, params)
-            results["insights"] = insights_result
+            results["insights"] = insights_future.result()
             # If we already attached tables via special aggregation, keep; otherwise expose stats for UI table
             if "tables" not in results and isinstance(results.get("insights"), dict):
                 data = results["insights"].get("data") or {}
@@ -175,7 +281,7 @@ class AnalyticsHandler:
                     results["tables"] = {"statistics": data["statistics"]}
 
             # 4) Debug/trace metadata
-            results["processed"] = {"shape": df.shape, "columns": df.columns.tolist()}
+            results["processed"] = {"shape": df.shape, "columns": list(df.columns)}
             return results
 
         except Exception as e:
@@ -183,7 +289,9 @@ class AnalyticsHandler:
             return {"error": str(e)}
 
     # -------------------------- Special-case aggregations --------------------------
-    def _maybe_apply_common_aggregation(self, df: pd.DataFrame, user_prompt: str) -> Optional[Dict[str, Any]]:
+    def _maybe_apply_common_aggregation(
+        self, df: pd.DataFrame, user_prompt: str, schema: Optional[SchemaInfo] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Detect very common analytics intents and compute them directly without requiring SQL/LLM.
         Currently supports:
@@ -196,7 +304,7 @@ class AnalyticsHandler:
 
         p = user_prompt.lower()
         # columns heuristics (expanded synonyms)
-        cols = {c.lower(): c for c in df.columns}
+        cols = (schema or self._build_schema(df)).lower_to_orig
         customer_col = (
             cols.get("customer")
             or cols.get("customer_id")
@@ -233,19 +341,25 @@ class AnalyticsHandler:
         )
         mentions_customer = any(k in p for k in ["customer", "client", "buyer"])
         # extract top N
-        import re
-        m = re.search(r"top\s+(\d{1,3})", p)
+        m = _TOP_N_RE.search(p)
         # Default to Top 10 when not specified; be explicit only when a number is present
         top_n = int(m.group(1)) if m else 10
 
         if customer_col and value_col and mentions_total and mentions_customer:
             try:
-                g = df.groupby(customer_col, dropna=False)
-                agg_dict = {value_col: "sum"}
+                sum_cols = [value_col]
                 if qty_col and qty_col in df.columns:
-                    agg_dict[qty_col] = "sum"
-                out = g.agg(agg_dict).reset_index()
-                # rename totals for clarity
+                    sum_cols.append(qty_col)
+                # Column-selected sum() takes the cythonized path; skip unused categories
+                # and the key sort since only the top N rows are kept. The key is grouped
+                # as-is: casting an object key to category first hashes it twice.
+                totals = df.groupby(customer_col, dropna=False, observed=True, sort=False)[sum_cols].sum()
+                if pd.api.types.is_numeric_dtype(totals[value_col]):
+                    totals = totals.nlargest(top_n, value_col)
+                else:
+                    totals = totals.sort_values(by=value_col, ascending=False).head(top_n)
+                out = totals.reset_index()
+                # rename totals for clarity (after trimming to top N)
                 rename_map = {}
                 if value_col in out.columns and value_col.lower() != "total":
                     rename_map[value_col] = f"total_{value_col}"
@@ -253,9 +367,7 @@ class AnalyticsHandler:
                     rename_map[qty_col] = f"total_{qty_col}"
                 if rename_map:
                     out = out.rename(columns=rename_map)
-                # sort by value desc
                 val_col_final = rename_map.get(value_col, value_col)
-                out = out.sort_values(by=val_col_final, ascending=False).head(top_n)
                 plural = customer_col if top_n == 1 else f"{customer_col}s"
                 title = f"Top {top_n} {plural} by {val_col_final}"
                 return {
@@ -281,34 +393,12 @@ class AnalyticsHandler:
         if not user_prompt:
             return False
 
-        prompt_lower = user_prompt.lower()
-
-        sql_keywords = [
-            # Filtering
-            "filter", "where", "only", "exclude", "select",
-            "specific", "particular", "certain",
-            # Aggregation
-            "sum", "total", "average", "mean", "count",
-            "group by", "grouped", "aggregate", "aggregated",
-            "per", "by category", "by type", "by group",
-            # Date/Time filtering
-            "year", "month", "date", "period", "between",
-            "since", "until", "before", "after", "during",
-            # Sorting/Limiting
-            "top", "bottom", "highest", "lowest", "first",
-            "last", "sort", "order", "rank",
-            # Calculations
-            "calculate", "compute", "derive", "maximum",
-            "minimum", "median", "percentile",
-        ]
-
-        if any(k in prompt_lower for k in sql_keywords):
+        if _SQL_KEYWORD_RE.search(user_prompt):
             logger.info("SQL intent detected from keywords.")
             return True
 
         # Year patterns like 2023, 1999, etc.
-        import re
-        if re.search(r"\b(19|20)\d{2}\b", user_prompt):
+        if _YEAR_RE.search(user_prompt):
             logger.info("Year pattern detected; likely a filter -> SQL needed.")
             return True
 
@@ -316,42 +406,34 @@ class AnalyticsHandler:
 
     # ---------------------------- Charting helpers ----------------------------
     def _extract_explicit_chart_requests(
-        self, user_prompt: str, df: pd.DataFrame
+        self, user_prompt: str, df: pd.DataFrame, schema: Optional[SchemaInfo] = None
     ) -> List[Dict[str, Any]]:
-        if not user_prompt:
+        if not user_prompt or not _ANY_CHART_RE.search(user_prompt):
             return []
 
         prompt_lower = user_prompt.lower()
-        explicit_charts: List[Dict[str, Any]] = []
-
-        chart_patterns: Dict[str, List[str]] = {
-            "line": ["line chart", "line graph", "trend line", "time series"],
-            "bar": ["bar chart", "bar graph", "column chart", "vertical bar"],
-            "scatter": ["scatter plot", "scatter chart", "scatterplot", "point plot"],
-            "pie": ["pie chart", "pie graph", "donut chart"],
-            "histogram": ["histogram", "distribution chart", "frequency chart"],
-            "box": ["box plot", "boxplot", "box and whisker"],
-            "heatmap": ["heatmap", "heat map", "correlation matrix"],
-            "area": ["area chart", "area graph", "filled line"],
-            "funnel": ["funnel chart", "funnel graph"],
-            "waterfall": ["waterfall chart", "waterfall graph"],
-        }
 
         requested_types: List[str] = [
-            ctype for ctype, pats in chart_patterns.items() if any(p in prompt_lower for p in pats)
+            ctype for ctype, pattern in _CHART_TYPE_RES.items() if pattern.search(user_prompt)
         ]
         requested_types = list(dict.fromkeys(requested_types))  # dedupe keep order
         if not requested_types:
             return []
 
-        numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-        categorical_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
-        mentioned_columns = [col for col in df.columns if col.lower() in prompt_lower]
+        schema = schema or self._build_schema(df)
+        # Identifier-like names are matched against the prompt's tokens (hash lookups);
+        # only names with spaces/punctuation fall back to a substring scan
+        prompt_tokens = set(_PROMPT_TOKEN_RE.findall(prompt_lower))
+        mentioned_columns = [
+            orig
+            for low, orig in schema.lower_to_orig.items()
+            if (low in prompt_tokens if _PROMPT_TOKEN_RE.fullmatch(low) else low in prompt_lower)
+        ]
 
         specs: List[Dict[str, Any]] = []
         for chart_type in requested_types:
             spec = self._build_chart_spec_from_prompt(
-                chart_type, df, user_prompt, numeric_cols, categorical_cols, mentioned_columns
+                chart_type, df, user_prompt, schema, mentioned_columns
             )
             if spec:
                 specs.append(spec)
@@ -362,10 +444,11 @@ class AnalyticsHandler:
         chart_type: str,
         df: pd.DataFrame,
         prompt: str,
-        numeric_cols: List[str],
-        categorical_cols: List[str],
+        schema: SchemaInfo,
         mentioned_columns: List[str],
     ) -> Optional[Dict[str, Any]]:
+        numeric_cols = schema.numeric_cols
+        categorical_cols = schema.categorical_cols
         spec: Dict[str, Any] = {
             "type": chart_type,
             "title": f"{chart_type.capitalize()} Chart",
@@ -420,11 +503,20 @@ class AnalyticsHandler:
 
         return spec if (spec.get("x") or spec.get("y") or spec.get("names")) else None
 
-    def _get_default_charts(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _get_default_charts(self, df: pd.DataFrame, schema: Optional[SchemaInfo] = None) -> List[Dict[str, Any]]:
         charts: List[Dict[str, Any]] = []
-        numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-        categorical_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
-        datetime_cols = self._detect_datetime_columns(df)
+        schema = schema or self._build_schema(df)
+        numeric_cols = schema.numeric_cols
+        categorical_cols = schema.categorical_cols
+        datetime_cols = schema.datetime_cols
+
+        # Parse + sort the (time, value) pair once; both time-series charts reuse it
+        ts = None
+        if datetime_cols and numeric_cols:
+            try:
+                ts = self._prepare_sorted_ts(df, datetime_cols[0], numeric_cols[0])
+            except Exception:
+                ts = None
 
         # Time series: core line + moving average overlay
         if datetime_cols and numeric_cols:
@@ -439,18 +531,16 @@ class AnalyticsHandler:
                 }
             )
             try:
-                sdf = df[[tcol, ycol]].copy()
-                if not np.issubdtype(sdf[tcol].dtype, np.datetime64):
-                    sdf[tcol] = pd.to_datetime(sdf[tcol], errors="coerce")
-                sdf = sdf.dropna(subset=[tcol]).sort_values(by=tcol)
-                sdf["MA_30"] = sdf[ycol].rolling(window=30, min_periods=5).mean()
+                t_sorted, y_sorted = ts
+                ma_30 = _rolling_mean(y_sorted, window=30, min_periods=5)
                 charts.append(
                     {
                         "type": "multi_line",
                         "data": {
-                            "x": self._to_list_safe(sdf[tcol]),
-                            ycol: self._to_list_safe(sdf[ycol]),
-                            "MA_30": self._to_list_safe(sdf["MA_30"]),
+                            "x": self._to_list_safe(t_sorted),
+                            # Float arrays go to Plotly as-is (typed-array encoding, no per-point lists)
+                            ycol: y_sorted,
+                            "MA_30": ma_30,
                         },
                         "series_names": [ycol, "MA_30"],
                         "title": f"{ycol} vs 30-day moving average",
@@ -487,15 +577,12 @@ class AnalyticsHandler:
             # Distribution of daily change if we have time
             if datetime_cols:
                 try:
-                    sdf = df[[datetime_cols[0], ycol]].copy()
-                    if not np.issubdtype(sdf[datetime_cols[0]].dtype, np.datetime64):
-                        sdf[datetime_cols[0]] = pd.to_datetime(sdf[datetime_cols[0]], errors="coerce")
-                    sdf = sdf.dropna().sort_values(by=datetime_cols[0])
-                    sdf["delta"] = sdf[ycol].diff()
+                    y_sorted = ts[1]
+                    delta = np.diff(y_sorted[~np.isnan(y_sorted)])
                     charts.append(
                         {
                             "type": "histogram",
-                            "data": sdf[["delta"]].dropna(),
+                            "data": pd.DataFrame({"delta": delta}),
                             "x": "delta",
                             "title": f"Distribution of daily change in {ycol}",
                             "reason": "Volatility signature via changes",
@@ -511,35 +598,11 @@ class AnalyticsHandler:
     ) -> Dict[str, Any]:
         try:
             generated: List[Dict[str, Any]] = []
-            for spec in chart_specs:
+            # Figures are independent, so build them concurrently and collect in spec order
+            futures = [_CHART_POOL.submit(self._render_chart, spec, df) for spec in chart_specs]
+            for fut in futures:
                 try:
-                    if spec.get("type") == "multi_line":
-                        fig = self.chart_gen.create_multi_series_chart(
-                            chart_type="line",
-                            data=spec.get("data") or {},
-                            series_names=spec.get("series_names", []),
-                            title=spec.get("title"),
-                        )
-                    else:
-                        fig = self.chart_gen.create_chart(
-                            chart_type=spec.get("type", "bar"),
-                            data=spec.get("data", df),
-                            title=spec.get("title", "Data Visualization"),
-                            x=spec.get("x"),
-                            y=spec.get("y"),
-                            x_label=spec.get("x_label"),
-                            y_label=spec.get("y_label"),
-                            names=spec.get("names"),
-                            values=spec.get("values"),
-                        )
-                    generated.append(
-                        {
-                            "figure": fig,
-                            "type": spec.get("type"),
-                            "title": spec.get("title"),
-                            "reason": spec.get("reason", ""),
-                        }
-                    )
+                    generated.append(fut.result())
                 except Exception as chart_error:
                     logger.warning("Chart generation failed: %s", chart_error)
                     continue
@@ -548,40 +611,109 @@ class AnalyticsHandler:
             logger.exception("Error generating charts")
             return {"success": False, "error": str(e)}
 
+    def _render_chart(self, spec: Dict[str, Any], df: pd.DataFrame) -> Dict[str, Any]:
+        if spec.get("type") == "multi_line":
+            fig = self.chart_gen.create_multi_series_chart(
+                chart_type="line",
+                data=spec.get("data") or {},
+                series_names=spec.get("series_names", []),
+                title=spec.get("title"),
+            )
+        else:
+            fig = self.chart_gen.create_chart(
+                chart_type=spec.get("type", "bar"),
+                data=spec.get("data", df),
+                title=spec.get("title", "Data Visualization"),
+                x=spec.get("x"),
+                y=spec.get("y"),
+                x_label=spec.get("x_label"),
+                y_label=spec.get("y_label"),
+                names=spec.get("names"),
+                values=spec.get("values"),
+            )
+        return {
+            "figure": fig,
+            "type": spec.get("type"),
+            "title": spec.get("title"),
+            "reason": spec.get("reason", ""),
+        }
+
     # ----------------------------- Insights helpers ----------------------------
     def _generate_insights(
-        self, df: pd.DataFrame, user_prompt: str, params: Dict[str, Any]
+        self,
+        df: pd.DataFrame,
+        user_prompt: str,
+        params: Dict[str, Any],
+        schema: Optional[SchemaInfo] = None,
     ) -> Dict[str, Any]:
         try:
+            # Reuse the request's column classification instead of select_dtypes per helper
+            numeric_cols = schema.numeric_cols if schema is not None else None
             provider = (params or {}).get("provider")
             context = f"User request: {user_prompt}" if user_prompt else None
             focus_areas = params.get("focus_areas") if params else None
             if provider == "foundry" and self.foundry is not None and FoundryService is not None:
                 # Try LLM insights first
                 try:
-                    llm_insights = self.insight_gen.generate_llm_insights(self.foundry, df, context, focus_areas)
+                    llm_insights = self.insight_gen.generate_llm_insights(
+                        self.foundry, df, context, focus_areas, numeric_cols=numeric_cols
+                    )
                     if llm_insights:
                         return {"success": True, "data": llm_insights, "source": "llm"}
                 except Exception as le:
                     logger.warning("LLM insights failed: %s", le)
             # Fallback deterministic
-            insights = self.insight_gen.generate_insights(data=df, context=context, focus_areas=focus_areas)
+            insights = self.insight_gen.generate_insights(
+                data=df, context=context, focus_areas=focus_areas, numeric_cols=numeric_cols
+            )
             return {"success": True, "data": insights, "source": "deterministic"}
         except Exception as e:
             logger.exception("Error generating insights")
             return {"success": False, "error": str(e)}
 
     # ---------------------------- LLM chart recs -----------------------------
-    def _try_llm_chart_recommendations(self, df: pd.DataFrame, user_prompt: str, provider: Optional[str]) -> List[Dict[str, Any]]:
+    def _try_llm_chart_recommendations(
+        self,
+        df: pd.DataFrame,
+        user_prompt: str,
+        provider: Optional[str],
+        schema: Optional[SchemaInfo] = None,
+    ) -> List[Dict[str, Any]]:
         if provider != "foundry" or self.foundry is None or FoundryService is None:
             return []
+        dtypes = df.dtypes  # one Series for the cache key, preview and schema lines
+        cache_key = (
+            getattr(self.foundry, "endpoint", None),
+            getattr(self.foundry, "agent_id", None),
+            user_prompt,
+            tuple(df.columns),
+            tuple(str(dt) for dt in dtypes),
+        )
+        with _LLM_REC_CACHE_LOCK:
+            cached = _LLM_REC_CACHE.get(cache_key)
+            if cached is not None:
+                _LLM_REC_CACHE.move_to_end(cache_key)
+                return [dict(spec) for spec in cached]
         try:
             # Summarize schema and sample
-            numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-            categorical_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
-            dt_cols = self._detect_datetime_columns(df)
-            head_preview = df.head(10).to_dict(orient="records")
-            schema_lines = [f"- {c}: {str(df[c].dtype)}" for c in df.columns]
+            schema = schema or self._build_schema(df)
+            numeric_cols = schema.numeric_cols
+            categorical_cols = schema.categorical_cols
+            dt_cols = schema.datetime_cols
+            # Compact per-column fingerprint (first 20 columns, 3 samples each) instead of raw rows
+            head = df.head(_PREVIEW_SCAN_ROWS)
+            head_preview = json.dumps(
+                {
+                    str(c): {
+                        "dtype": str(dt),
+                        "sample": head[c].dropna().head(3).tolist(),
+                        "nunique_approx": min(int(head[c].nunique()), 50),
+                    }
+                    for c, dt in dtypes.iloc[:_PREVIEW_MAX_COLS].items()
+                },
+                default=str,
+            )
+            schema_lines = [f"- {c}: {dt}" for c, dt in dtypes.items()]
             prompt = (
                 "You are a data viz assistant. Propose 2-4 relevant charts for the user's request.\n"
                 "Return STRICT JSON array of objects with keys: type, title, reason, and one of:\n"
@@ -593,23 +725,16 @@ class AnalyticsHandler:
                 f"Detected datetime cols: {dt_cols}\n"
                 f"Numeric cols: {numeric_cols}\n"
                 f"Categorical cols: {categorical_cols}\n\n"
-                f"Sample rows (JSON):\n{head_preview}\n\n"
+                f"Column preview (dtype, sample values, approx distinct count):\n{head_preview}\n\n"
                 "Output: JSON only, no extra text."
             )
             text = self.foundry.complete(prompt)
-            import json as _json
-            specs = _json.loads(text)
+            specs = json.loads(text)
             if not isinstance(specs, list):
                 return []
             # Basic validation
-            out: List[Dict[str, Any]] = []
-            for s in specs:
-                if not isinstance(s, dict):
-                    continue
-                ctype = s.get("type")
-                if ctype not in {"line", "bar", "scatter", "area", "pie", "histogram", "box", "heatmap"}:
-                    continue
-                out.append({
+            out: List[Dict[str, Any]] = [
+                {
                     "type": ctype,
                     "x": s.get("x"),
                     "y": s.get("y"),
@@ -617,8 +742,17 @@ class AnalyticsHandler:
                     "values": s.get("values"),
                     "title": s.get("title") or f"{ctype.capitalize()} Chart",
                     "reason": s.get("reason") or "LLM recommendation",
-                })
-            return out[:4]
+                }
+                for s in specs
+                if isinstance(s, dict) and (ctype := s.get("type")) in _ALLOWED_CHART_TYPES
+            ][:4]
+            if out:
+                with _LLM_REC_CACHE_LOCK:
+                    _LLM_REC_CACHE[cache_key] = out
+                    _LLM_REC_CACHE.move_to_end(cache_key)
+                    while len(_LLM_REC_CACHE) > _LLM_REC_CACHE_MAX:
+                        _LLM_REC_CACHE.popitem(last=False)
+            return [dict(spec) for spec in out]
         except Exception as e:
             logger.warning("LLM chart recommendation failed: %s", e)
             return []
@@ -629,59 +763,122 @@ class AnalyticsHandler:
             if isinstance(data, pd.DataFrame):
                 return data
             if isinstance(data, dict):
-                return pd.DataFrame(data)
+                return pd.DataFrame.from_dict(data)
             if isinstance(data, list):
                 return pd.DataFrame(data)
             if isinstance(data, str):
-                # JSON first
-                try:
-                    parsed = json.loads(data)
-                    return pd.DataFrame(parsed)
-                except Exception:
-                    pass
-                # Files
-                if data.endswith(".csv"):
+                # Files first: a path never parses as JSON, so don't pay for the failed attempt
+                low = data.lower()
+                if low.endswith(".csv"):
                     return pd.read_csv(data)
-                if data.endswith(".xlsx") or data.endswith(".xls"):
+                if low.endswith((".xlsx", ".xls")):
                     return pd.read_excel(data)
+                try:
+                    return pd.DataFrame(json.loads(data))
+                except Exception:
+                    return None
             return None
         except Exception as e:
             logger.warning("Error preparing data: %s", e)
             return None
 
+    def _build_schema(self, df: pd.DataFrame) -> SchemaInfo:
+        """Classify columns in a single pass over df.dtypes."""
+        numeric_cols: List[str] = []
+        categorical_cols: List[str] = []
+        datetime_typed: List[str] = []
+        for c, dt in df.dtypes.items():
+            # select_dtypes(include=["number"]) minus timedeltas / (["object", "category"]),
+            # via dtype.kind (numpy and nullable extension dtypes) instead of is_*_dtype calls
+            if dt.kind in "iufc":
+                numeric_cols.append(c)
+            elif dt == object or isinstance(dt, pd.CategoricalDtype):
+                categorical_cols.append(c)
+            elif dt.kind == "M":  # datetime64, tz-aware included
+                datetime_typed.append(c)
+        return SchemaInfo(
+            numeric_cols=numeric_cols,
+            categorical_cols=categorical_cols,
+            # Typed datetime columns come from the same pass; only sniff strings when there are none
+            datetime_cols=datetime_typed or self._detect_datetime_columns(df),
+            lower_to_orig={str(c).lower(): c for c in df.columns},
+        )
+
+    def _prepare_sorted_ts(self, df: pd.DataFrame, tcol: str, ycol: str):
+        """Rows with a valid timestamp, ordered by time: (time Series, float ndarray of values)."""
+        t = df[tcol]
+        if not pd.api.types.is_datetime64_any_dtype(t.dtype):
+            t = pd.to_datetime(t, errors="coerce")
+        valid = np.flatnonzero(t.notna().to_numpy())
+        t_ns = t.to_numpy(dtype="datetime64[ns]")[valid]
+        order = valid[np.argsort(t_ns, kind="stable")]
+        values = df[ycol].to_numpy()
+        if values.dtype.kind in "fiu":
+            # Plain numpy column: gather first, so only the kept rows are converted
+            y = values[order].astype("float64", copy=False)
+        else:
+            y = df[ycol].to_numpy(dtype="float64", na_value=np.nan)[order]
+        return t.iloc[order], y
+
     def _detect_datetime_columns(self, df: pd.DataFrame) -> List[str]:
-        dt_cols = [c for c in df.columns if np.issubdtype(df[c].dtype, np.datetime64)]
+        dt_cols = [c for c, dt in df.dtypes.items() if pd.api.types.is_datetime64_any_dtype(dt)]
         if dt_cols:
             return dt_cols
         candidates: List[str] = []
         for c in df.columns:
             s = df[c]
             if s.dtype == object or isinstance(s.dtype, pd.CategoricalDtype):
-                sample = s.dropna().astype(str).head(25)
+                # Stringify only the sample, not the whole column
+                sample = s.dropna().head(25).astype(str)
                 if not len(sample):
                     continue
-                parsed = pd.to_datetime(sample, errors="coerce")
+                # Cheap reject before the parser: first value must look date-ish
+                if not _DATE_HINT_RE.search(sample.iloc[0]):
+                    continue
+                parsed = pd.to_datetime(sample, errors="coerce", format="mixed")
                 if parsed.notna().mean() >= 0.8:
                     candidates.append(c)
         return candidates
 
+    def _to_records(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Row dicts built from per-column tolist() (native Python scalars, no per-cell boxing)."""
+        columns = df.columns.tolist()
+        col_values = [df[c].tolist() for c in columns]
+        return [dict(zip(columns, row)) for row in zip(*col_values)]
+
     def _to_list_safe(self, series: pd.Series) -> List[Any]:
+        dtype = series.dtype
+        if pd.api.types.is_datetime64_any_dtype(dtype) and getattr(dtype, "tz", None) is None:
+            # ISO strings in one vectorized pass; NaT -> None
+            out = series.dt.strftime("%Y-%m-%dT%H:%M:%S")
+            return out.astype(object).where(series.notna(), None).tolist()
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            if pd.api.types.is_integer_dtype(dtype) and not series.hasnans:
+                return series.tolist()
+            # NaN/Inf -> None without a per-element Python branch
+            arr = series.to_numpy(dtype="float64", na_value=np.nan)
+            out = arr.astype(object)
+            out[~np.isfinite(arr)] = None
+            return out.tolist()
+        if isinstance(dtype, pd.api.extensions.ExtensionDtype) and not isinstance(dtype, pd.CategoricalDtype):
+            # string/boolean/tz-aware datetime etc. already box to Python objects; NA -> None in bulk
+            return series.to_numpy(dtype=object, na_value=None).tolist()
         out: List[Any] = []
+        # Object/categorical values can be anything (incl. numpy scalars stored in object
+        # columns): exact type() checks for the common JSON primitives first
         for v in series.tolist():
-            if isinstance(v, pd.Timestamp):
-                out.append(v)  # let your serializer handle ISO conversion
-                continue
-            try:
-                if v is None:
-                    out.append(None)
-                elif isinstance(v, float) and (np.isnan(v) or np.isinf(v)):
-                    out.append(None)
-                elif isinstance(v, (np.floating, np.integer)):
-                    out.append(v.item())
-                else:
-                    out.append(v)
-            except Exception:
+            t = type(v)
+            if t is str or t is int or t is bool:
+                out.append(v)
+            elif t is float:
+                out.append(v if v - v == 0 else None)  # NaN/Inf -> None
+            elif v is None or v is pd.NA or v is pd.NaT:
                 out.append(None)
+            elif isinstance(v, (np.floating, np.integer)):
+                v = v.item()
+                out.append(None if type(v) is float and v - v != 0 else v)
+            else:
+                out.append(v)  # e.g. Timestamps: let your serializer handle ISO conversion
         return out
 
 
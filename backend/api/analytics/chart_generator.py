@@ -3,12 +3,18 @@ Chart generation utilities (backend/Django) inspired by chatui version.
 - Returns Plotly figure as JSON for frontend rendering.
 """
 from typing import Any, Dict, Optional, List
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
 
 def _prepare_dataframe(data: Any) -> pd.DataFrame:
+    t = type(data)  # exact checks first; isinstance below still covers subclasses
+    if t is pd.DataFrame:
+        return data
+    if t is dict or t is list:
+        return pd.DataFrame(data)
     if isinstance(data, pd.DataFrame):
         return data
     if isinstance(data, dict):
@@ -18,6 +24,88 @@ def _prepare_dataframe(data: Any) -> pd.DataFrame:
     raise ValueError("Data must be DataFrame, dict, or list")
 
 
+# Scalar types that are JSON-safe as-is
+_PLAIN_TYPES = frozenset({str, int, bool, type(None)})
+
+
+def _array_to_list(a: np.ndarray) -> List[Any]:
+    """ndarray -> JSON-safe list in vectorized passes (non-finite/NaT -> None)."""
+    if a.dtype.kind == "f":
+        finite = np.isfinite(a)
+        if finite.all():
+            return a.tolist()
+        out = a.astype(object)
+        out[~finite] = None
+        return out.tolist()
+    if a.dtype.kind in "iub":
+        return a.tolist()
+    if a.dtype.kind == "M":
+        # ISO strings like Plotly's own encoder (tolist() would give epoch ints); NaT -> None
+        out = np.datetime_as_string(a, unit="auto").astype(object)
+        out[np.isnat(a)] = None
+        return out.tolist()
+    lst = a.tolist()
+    _sanitize_inplace(lst)
+    return lst
+
+
+def _safe_scalar(v: Any) -> Any:
+    """Replacement for one non-container value, or v itself when already JSON-safe."""
+    if type(v) is float:
+        return v if v - v == 0 else None  # inf - inf and nan - nan are both nan
+    if isinstance(v, np.ndarray):
+        return _array_to_list(v)
+    # Plotly may use numpy scalar types; convert to Python scalars
+    if isinstance(v, (np.floating, np.integer)):
+        return _safe_scalar(v.item())
+    if isinstance(v, float):
+        return float(v) if v - v == 0 else None
+    return v
+
+
+def _sanitize_inplace(root: Any) -> None:
+    """Replace non-finite floats with None and unwrap numpy values, walking root with an explicit stack."""
+    stack = [root]
+    while stack:
+        o = stack.pop()
+        items = o.items() if type(o) is dict else enumerate(o)
+        for k, v in items:
+            t = type(v)
+            if t in _PLAIN_TYPES:
+                continue
+            if t is float:
+                if v - v != 0:  # NaN/Inf
+                    o[k] = None
+            elif t is list or t is dict:
+                stack.append(v)
+            elif t is tuple:
+                o[k] = v = list(v)
+                stack.append(v)
+            else:
+                new = _safe_scalar(v)
+                if new is not v:
+                    o[k] = new
+
+
+def _json_safe(o: Any) -> Any:
+    """Return o made JSON-safe; lists/dicts are sanitized in place rather than copied."""
+    if type(o) is list or type(o) is dict:
+        _sanitize_inplace(o)
+        return o
+    return _safe_scalar(o)
+
+
+def _is_json_native(o: Any) -> bool:
+    """True when o is already JSON-safe: plain scalars/finite floats in (nested) dicts only."""
+    if type(o) in _PLAIN_TYPES:
+        return True
+    if type(o) is float:
+        return o - o == 0
+    if isinstance(o, dict):
+        return all(_is_json_native(v) for v in o.values())
+    return False
+
+
 def figure_to_json(fig: go.Figure) -> Dict[str, Any]:
     """Return a JSON-safe Plotly figure spec (NaN/Inf -> null).
 
@@ -25,28 +113,16 @@ def figure_to_json(fig: go.Figure) -> Dict[str, Any]:
     (e.g., rolling means, diffs). We recursively replace non-finite floats
     with None to keep responses JSON-compliant.
     """
-    import math
-
-    def _san(o: Any):
-        if isinstance(o, float):
-            return None if not math.isfinite(o) else o
-        if isinstance(o, (int, str)) or o is None:
-            return o
-        if isinstance(o, list):
-            return [_san(v) for v in o]
-        if isinstance(o, dict):
-            return {k: _san(v) for k, v in o.items()}
-        # Plotly may use numpy types; try converting
-        try:
-            from numpy import float_, integer
-            if isinstance(o, (float_, integer)):
-                v = o.item()
-                return None if isinstance(v, float) and not math.isfinite(v) else v
-        except Exception:
-            pass
-        return o
+    spec = fig.to_plotly_json()
+    # Typed-array traces ({"dtype", "bdata"}) are already safe; only walk traces with lists/numpy values
+    return {
+        k: [tr if _is_json_native(tr) else _json_safe(tr) for tr in v] if k == "data" else _json_safe(v)
+        for k, v in spec.items()
+    }
+
 
-    return _san(fig.to_plotly_json())
+# Chart types ChartGenerator builds as a single go trace when no extra px options are given
+_XY_TRACE_TYPES = frozenset({"line", "bar", "scatter", "area"})
 
 
 class ChartGenerator:
@@ -90,7 +166,14 @@ class ChartGenerator:
         names_kw = kwargs.pop("names", None)
         values_kw = kwargs.pop("values", None)
 
-        if ctype == "line":
+        xy_cols = None
+        if ctype in _XY_TRACE_TYPES and (not kwargs or (ctype == "bar" and set(kwargs) == {"orientation"})):
+            xy_cols = (x or df.columns[0], y or df.columns[1])
+            if not all(isinstance(c, str) and c in df.columns for c in xy_cols):
+                xy_cols = None  # e.g. a list of y columns (wide form): px builds one trace per column
+        if xy_cols is not None:
+            fig = self._xy_figure(ctype, df, *xy_cols, orientation=kwargs.get("orientation", "v"))
+        elif ctype == "line":
             fig = px.line(df, x=x or df.columns[0], y=y or df.columns[1], **kwargs)
         elif ctype == "bar":
             orientation = kwargs.pop("orientation", "v")
@@ -105,10 +188,23 @@ class ChartGenerator:
                 names = df.columns[0]
             if values is None:
                 values = df.columns[1]
-            if not pd.api.types.is_numeric_dtype(df[values]):
+            vals = df[values]
+            if not pd.api.types.is_numeric_dtype(vals):
+                vals = pd.to_numeric(vals, errors="coerce")
+            if kwargs:
+                # Extra px options need the frame; coerce on a copy
                 df = df.copy()
-                df[values] = pd.to_numeric(df[values], errors="coerce")
-            fig = px.pie(df, names=names, values=values, **{k: v for k, v in kwargs.items()})
+                df[values] = vals
+                fig = px.pie(df, names=names, values=values, **kwargs)
+            else:
+                # Same trace px.pie emits, from the two columns only (no frame copy)
+                fig = go.Figure(go.Pie(
+                    labels=df[names],
+                    values=vals,
+                    name="",
+                    showlegend=True,
+                    hovertemplate=f"{names}=%{{label}}<br>{values}=%{{value}}<extra></extra>",
+                ))
         elif ctype == "histogram":
             fig = px.histogram(df, x=x or df.columns[0], **kwargs)
         elif ctype == "box":
@@ -125,6 +221,27 @@ class ChartGenerator:
         fig.update_layout(title=title, xaxis_title=x_label, yaxis_title=y_label, **self.default_layout)
         return figure_to_json(fig)
 
+    def _xy_figure(self, ctype: str, df: pd.DataFrame, x: Any, y: Any, orientation: str) -> go.Figure:
+        """Single-trace line/bar/scatter/area built directly as graph objects.
+
+        Mirrors what Plotly Express emits for these (mode, hover text, stacking) without
+        its per-call column inference and validation, which dominates small-chart latency.
+        """
+        common = {
+            "x": df[x],
+            "y": df[y],
+            "name": "",
+            "showlegend": False,
+            "hovertemplate": f"{x}=%{{x}}<br>{y}=%{{y}}<extra></extra>",
+        }
+        if ctype == "bar":
+            fig = go.Figure(go.Bar(orientation=orientation, **common))
+            fig.update_layout(barmode="relative")
+            return fig
+        if ctype == "area":
+            return go.Figure(go.Scatter(mode="lines", stackgroup="1", **common))
+        return go.Figure(go.Scatter(mode="markers" if ctype == "scatter" else "lines", **common))
+
     def create_multi_series_chart(
         self,
         chart_type: str,
@@ -146,3 +263,7 @@ class ChartGenerator:
                 fig.add_trace(go.Scatter(x=x_values, y=y_values, fill="tozeroy", name=series_name))
         fig.update_layout(title=title, **self.default_layout)
         return figure_to_json(fig)
+
+
+# Stateless, so one shared instance serves every handler/request
+chart_generator = ChartGenerator()
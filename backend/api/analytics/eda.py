@@ -5,7 +5,6 @@ EDA endpoints wiring for Django.
 """
 from __future__ import annotations
 from typing import Any, Dict
-import io
 import pandas as pd
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -23,24 +22,41 @@ try:
 except Exception:
     FoundryService = None  # type: ignore
 
+try:
+    import pyarrow  # type: ignore  # noqa: F401  (optional: multithreaded CSV parsing)
+    _CSV_ENGINE = "pyarrow"
+except Exception:
+    _CSV_ENGINE = None  # pandas' default C parser
+
+
+def _read_csv(source: Any) -> pd.DataFrame:
+    """read_csv with the pyarrow engine when available; default parser if it's missing or fails."""
+    if _CSV_ENGINE is not None:
+        try:
+            return pd.read_csv(source, engine=_CSV_ENGINE)
+        except Exception:
+            if hasattr(source, "seek"):
+                source.seek(0)
+    return pd.read_csv(source)
+
 
 def _df_from_request(request) -> pd.DataFrame:
     # 1) file upload
     f = request.FILES.get("file")
     if f is not None:
         name = (getattr(f, "name", "") or "").lower()
-        data = f.read()
-        bio = io.BytesIO(data)
+        # Parse straight from the upload (on-disk path for large files) instead of copying into BytesIO
+        source = f.temporary_file_path() if hasattr(f, "temporary_file_path") else f
         if name.endswith(".csv"):
-            return pd.read_csv(bio)
+            return _read_csv(source)
         elif name.endswith(".xlsx") or name.endswith(".xls"):
-            return pd.read_excel(bio)
+            return pd.read_excel(source)
         elif name.endswith(".json"):
             # Support JSON dataset uploads: { data: [...] } or array of records
             import json
-            bio.seek(0)
+            f.seek(0)
             try:
-                payload = json.loads(bio.read().decode("utf-8"))
+                payload = json.loads(f.read().decode("utf-8"))
             except Exception as je:
                 raise ValueError(f"Invalid JSON file: {je}")
             if isinstance(payload, dict):
@@ -60,11 +76,11 @@ def _df_from_request(request) -> pd.DataFrame:
         else:
             # try CSV as default
             try:
-                bio.seek(0)
-                return pd.read_csv(bio)
+                f.seek(0)
+                return _read_csv(source)
             except Exception:
-                bio.seek(0)
-                return pd.read_excel(bio)
+                f.seek(0)
+                return pd.read_excel(source)
 
     # 2) JSON body { data: [...] }
     body = request.data or {}
@@ -3,61 +3,166 @@ Insight generation utilities (backend/Django).
 - Provides comprehensive statistics and pattern detection similar to chatui version
 - No LLM dependency; returns deterministic, useful narratives by default
 """
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional
+import hashlib
 import pandas as pd
 import numpy as np
 import json
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Process-wide LRU of calculate_statistics results keyed on the numeric columns' content,
+# so re-posting the same dataset (new prompt/chart type) skips the reductions
+_STATS_CACHE: "OrderedDict[tuple, Dict[str, Dict[str, float]]]" = OrderedDict()
+_STATS_CACHE_MAX = 32
+_STATS_CACHE_LOCK = threading.Lock()
 
-def calculate_statistics(df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+
+def _as_floats(values: Any) -> np.ndarray:
+    return values.to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _moments(values: np.ndarray) -> tuple:
+    """Per-row count, mean, sample std and skewness of a (columns, rows) float64 matrix.
+
+    Same two-pass sums and guards as pandas' mean/std/skew (NaN skipped, m2/m3 < 1e-14
+    treated as 0), but the mask, centering and power sums are built once for all three.
+    """
+    mask = np.isnan(values)
+    count = (values.shape[1] - mask.sum(axis=1)).astype("float64")
+    values = np.where(mask, 0.0, values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = values.sum(axis=1) / count
+        adjusted = values - mean[:, None]
+        adjusted[mask] = 0.0
+        adjusted2 = adjusted ** 2
+        m2 = adjusted2.sum(axis=1)
+        m3 = (adjusted2 * adjusted).sum(axis=1)
+        std = np.sqrt(m2 / (count - 1))
+        m2 = np.where(np.abs(m2) < 1e-14, 0.0, m2)
+        m3 = np.where(np.abs(m3) < 1e-14, 0.0, m3)
+        skew = (count * (count - 1) ** 0.5 / (count - 2)) * (m3 / m2 ** 1.5)
+    std[count < 2] = np.nan
+    skew = np.where(m2 == 0, 0.0, skew)
+    skew[count < 3] = np.nan
+    return count, mean, std, skew
+
+
+def _stats_cache_key(num: pd.DataFrame) -> Optional[tuple]:
+    """(names, dtypes, shape, content digest) for a numeric frame; None if it can't be hashed."""
+    try:
+        row_hashes = pd.util.hash_pandas_object(num, index=False).to_numpy()
+    except Exception:
+        return None
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+    return (tuple(num.columns), tuple(str(dt) for dt in num.dtypes), num.shape, digest)
+
+
+def calculate_statistics(
+    df: pd.DataFrame, numeric_cols: Optional[List[str]] = None
+) -> Dict[str, Dict[str, float]]:
+    """Per-column descriptive stats; pass numeric_cols when the caller already classified df."""
     stats: Dict[str, Dict[str, float]] = {}
-    for col in df.select_dtypes(include=[np.number]).columns:
-        s = df[col].dropna()
-        if len(s) == 0:
+    num = df[numeric_cols] if numeric_cols is not None else df.select_dtypes(include=[np.number])
+    if num.shape[1] == 0 or len(num) == 0:
+        return stats
+    row = _as_floats(num.iloc[0]) if len(num) == 1 else None
+    if row is not None and not np.isinf(row).any():
+        # One finite row: location stats are the value itself and spread stats are 0, so
+        # skip every frame-wide reduction and the cache hash
+        for col, v in zip(num.columns, row.tolist()):
+            if v != v:
+                continue  # missing -> count 0
+            stats[col] = {
+                "mean": v, "median": v, "std": 0.0, "min": v, "max": v, "q25": v, "q75": v,
+                "iqr": 0.0, "range": 0.0, "cv": 0.0, "skewness": 0.0, "count": 1, "missing": 0,
+            }
+        return stats
+    cache_key = _stats_cache_key(num)
+    if cache_key is not None:
+        with _STATS_CACHE_LOCK:
+            cached = _STATS_CACHE.get(cache_key)
+            if cached is not None:
+                _STATS_CACHE.move_to_end(cache_key)
+                return {col: dict(vals) for col, vals in cached.items()}
+    # Column-wise reductions, each computed once for all columns, stacked into one
+    # float matrix (NaN -> 0.0) so the loop below only does positional indexing
+    counts_f, mean_a, std_a, skew_a = _moments(np.ascontiguousarray(_as_floats(num).T))
+    summary = np.vstack([
+        mean_a,
+        std_a,
+        _as_floats(num.min()),
+        _as_floats(num.max()),
+        _as_floats(num.quantile([0.25, 0.75])),
+        # median() rather than the 0.5 quantile: interpolating at an exact position
+        # still multiplies by 0, so an inf in the column would turn into NaN
+        _as_floats(num.median()),
+        skew_a,
+    ])
+    summary[np.isnan(summary)] = 0.0
+    means, stds, mins, maxs, q25s, q75s, medians, skews = summary.tolist()
+    counts = counts_f.astype("int64").tolist()
+    missing = (len(num) - counts_f).astype("int64").tolist()
+    for i, col in enumerate(num.columns):
+        count = counts[i]
+        if count == 0:
             continue
-        mean_val = float(s.mean()) if pd.notna(s.mean()) else 0.0
-        std_val = float(s.std()) if pd.notna(s.std()) else 0.0
-        min_val = float(s.min()) if pd.notna(s.min()) else 0.0
-        max_val = float(s.max()) if pd.notna(s.max()) else 0.0
-        q25 = float(s.quantile(0.25)) if pd.notna(s.quantile(0.25)) else 0.0
-        q75 = float(s.quantile(0.75)) if pd.notna(s.quantile(0.75)) else 0.0
-        iqr = q75 - q25
+        mean_val, std_val = means[i], stds[i]
+        min_val, max_val = mins[i], maxs[i]
+        q25, q75 = q25s[i], q75s[i]
         stats[col] = {
             "mean": mean_val,
-            "median": float(s.median()) if pd.notna(s.median()) else 0.0,
+            "median": medians[i],
             "std": std_val,
             "min": min_val,
             "max": max_val,
             "q25": q25,
             "q75": q75,
-            "iqr": iqr,
+            "iqr": q75 - q25,
             "range": max_val - min_val,
             "cv": (std_val / abs(mean_val) * 100) if mean_val else 0.0,
-            "skewness": float(s.skew()) if len(s) > 2 and pd.notna(s.skew()) else 0.0,
-            "count": int(s.count()),
-            "missing": int(df[col].isna().sum()),
+            "skewness": skews[i] if count > 2 else 0.0,
+            "count": count,
+            "missing": missing[i],
         }
+    if cache_key is not None:
+        with _STATS_CACHE_LOCK:
+            _STATS_CACHE[cache_key] = {col: dict(vals) for col, vals in stats.items()}
+            _STATS_CACHE.move_to_end(cache_key)
+            while len(_STATS_CACHE) > _STATS_CACHE_MAX:
+                _STATS_CACHE.popitem(last=False)
     return stats
 
 
+# Static text for generate_basic_insights (tuples: shared across calls, serialize as JSON arrays)
+_BASIC_INSIGHTS = (
+    "Descriptive statistics computed for numeric columns.",
+    "Review distribution metrics to understand spread and skewness.",
+)
+_BASIC_RECOMMENDATIONS = (
+    "Check high CV columns for variability.",
+    "Investigate outliers based on IQR bounds.",
+)
+
+
 def generate_basic_insights(df: pd.DataFrame, stats: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+    rows, cols = df.shape
     return {
-        "key_findings": f"Dataset has {df.shape[0]} rows and {df.shape[1]} columns.",
-        "insights": [
-            "Descriptive statistics computed for numeric columns.",
-            "Review distribution metrics to understand spread and skewness.",
-        ],
-        "recommendations": [
-            "Check high CV columns for variability.",
-            "Investigate outliers based on IQR bounds.",
-        ],
+        "key_findings": f"Dataset has {rows} rows and {cols} columns.",
+        "insights": _BASIC_INSIGHTS,
+        "recommendations": _BASIC_RECOMMENDATIONS,
     }
 
 
 def dataframe_from_any(data: Any) -> pd.DataFrame:
+    t = type(data)
+    if t is pd.DataFrame:
+        return data
+    if t is list or t is dict:
+        return pd.DataFrame(data)
     if isinstance(data, pd.DataFrame):
         return data
     if isinstance(data, dict):
@@ -78,10 +183,11 @@ class InsightGenerator:
         data: pd.DataFrame,
         context: Optional[str] = None,
         focus_areas: Optional[List[str]] = None,
+        numeric_cols: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         try:
-            stats = self._calculate_statistics(data)
-            patterns = self._detect_patterns(data)
+            stats = self._calculate_statistics(data, numeric_cols)
+            patterns = self._detect_patterns(data, numeric_cols)
             narrative = self._narrative_fallback(data, stats, patterns, context, focus_areas)
             return {
                 "statistics": stats,
@@ -100,24 +206,28 @@ class InsightGenerator:
         data: pd.DataFrame,
         context: Optional[str] = None,
         focus_areas: Optional[List[str]] = None,
+        numeric_cols: Optional[List[str]] = None,
     ) -> Optional[Dict[str, Any]]:
         """Use Azure AI Foundry to produce richer insights.
 
         Returns a dict with keys matching deterministic insights or None on failure.
         """
         try:
-            stats = self._calculate_statistics(data)
-            patterns = self._detect_patterns(data)
+            stats = self._calculate_statistics(data, numeric_cols)
+            patterns = self._detect_patterns(data, numeric_cols)
 
             focus_txt = ", ".join(focus_areas) if focus_areas else ""
+            # Compact, key-sorted JSON: fewer prompt tokens, and equal inputs give equal prompt text
+            stats_json = json.dumps(stats, sort_keys=True, separators=(",", ":"))
+            patterns_json = json.dumps(patterns, sort_keys=True, separators=(",", ":"))
             prompt = (
                 "You are a senior data analyst. Write concise insights for stakeholders.\n"
                 "Return STRICT JSON with keys: key_findings (string), insights (array[string]), recommendations (array[string]).\n"
                 "Keep it factual based on the provided stats and patterns, avoid speculation.\n\n"
                 f"Context: {context or 'n/a'}\n"
                 f"Focus areas: {focus_txt or 'n/a'}\n\n"
-                f"Statistics (JSON):\n{json.dumps(stats)}\n\n"
-                f"Patterns (JSON):\n{json.dumps(patterns)}\n\n"
+                f"Statistics (JSON):\n{stats_json}\n\n"
+                f"Patterns (JSON):\n{patterns_json}\n\n"
                 "Output JSON only."
             )
             text = foundry_service.complete(prompt)
@@ -137,70 +247,95 @@ class InsightGenerator:
             return None
 
     # --- Internal helpers (largely aligned with chatui implementation) ---
-    def _calculate_statistics(self, data: pd.DataFrame) -> Dict[str, Any]:
-        return calculate_statistics(data)
+    def _calculate_statistics(
+        self, data: pd.DataFrame, numeric_cols: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        return calculate_statistics(data, numeric_cols)
 
-    def _detect_patterns(self, data: pd.DataFrame) -> Dict[str, Any]:
+    def _detect_patterns(
+        self, data: pd.DataFrame, numeric_cols: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         patterns: Dict[str, Any] = {"trends": [], "outliers": [], "correlations": []}
 
-        numeric_cols = data.select_dtypes(include=[np.number]).columns
-        # Simple trend via slope on index order
-        for col in numeric_cols:
-            if len(data) > 1:
-                x = np.arange(len(data))
-                y = data[col].to_numpy(dtype=float)
-                mask = ~np.isnan(y)
-                if mask.sum() > 1:
-                    try:
-                        slope = float(np.polyfit(x[mask], y[mask], 1)[0])
-                        if np.isfinite(slope):
-                            # Scale threshold to std for robustness
-                            std_val = float(np.nanstd(y)) if np.isfinite(np.nanstd(y)) else 0.0
-                            if std_val and abs(slope) > (std_val * 0.1):
-                                patterns["trends"].append(
-                                    {
-                                        "column": col,
-                                        "direction": "increasing" if slope > 0 else "decreasing",
-                                        "strength": abs(slope),
-                                    }
-                                )
-                    except Exception:
-                        continue
-
-        # Outliers via IQR
-        for col in numeric_cols:
+        if numeric_cols is None:
+            numeric_cols = data.select_dtypes(include=[np.number]).columns
+        # Float64 copy of the numeric columns (NaN for missing), shared by the passes below
+        num_cols = list(numeric_cols)
+        num = data[num_cols]
+        arr = num.to_numpy(dtype="float64", na_value=np.nan)
+
+        # Simple trend via least-squares slope on index order. Columns without missing values
+        # share x, so their slopes come from one matrix product; the rest are fitted on observed rows
+        if len(arr) > 1 and num_cols:
             try:
-                s = data[col].astype(float)
-                q1 = float(s.quantile(0.25))
-                q3 = float(s.quantile(0.75))
+                x = np.arange(len(arr), dtype="float64")
+                slopes = np.full(len(num_cols), np.nan)
+                stds = np.zeros(len(num_cols))
+                has_nan = np.isnan(arr).any(axis=0)
+                with np.errstate(invalid="ignore", over="ignore"):
+                    if not has_nan.all():
+                        full = ~has_nan
+                        Y = arr[:, full]
+                        xc = x - x.mean()
+                        slopes[full] = xc @ (Y - Y.mean(axis=0)) / (xc @ xc)
+                        stds[full] = Y.std(axis=0)
+                    for j in np.flatnonzero(has_nan):
+                        y = arr[:, j]
+                        mask = ~np.isnan(y)
+                        if mask.sum() > 1:
+                            xm, ym = x[mask], y[mask]
+                            xc = xm - xm.mean()
+                            slopes[j] = xc @ (ym - ym.mean()) / (xc @ xc)
+                            stds[j] = ym.std()
+                    # Scale threshold to std for robustness (non-finite slope/std never passes)
+                    keep = np.isfinite(stds) & (stds != 0) & (np.abs(slopes) > stds * 0.1)
+                for j in np.flatnonzero(keep):
+                    slope = float(slopes[j])
+                    patterns["trends"].append(
+                        {
+                            "column": num_cols[j],
+                            "direction": "increasing" if slope > 0 else "decreasing",
+                            "strength": abs(slope),
+                        }
+                    )
+            except Exception:
+                pass
+
+        # Outliers via IQR: quartiles for every column in one call, bounds broadcast over the matrix
+        if num_cols:
+            try:
+                q1, q3 = _as_floats(num.quantile([0.25, 0.75]))
                 iqr = q3 - q1
-                lower = q1 - 1.5 * iqr
-                upper = q3 + 1.5 * iqr
-                mask = (s < lower) | (s > upper)
-                if mask.any():
-                    out_vals = s[mask].tolist()
+                mask = (arr < q1 - 1.5 * iqr) | (arr > q3 + 1.5 * iqr)
+                counts = mask.sum(axis=0)
+                for j in np.flatnonzero(counts):
+                    rows = np.flatnonzero(mask[:, j])[:5]
                     patterns["outliers"].append(
-                        {"column": col, "count": int(mask.sum()), "values": out_vals[:5]}
+                        {"column": num_cols[j], "count": int(counts[j]), "values": arr[rows, j].tolist()}
                     )
             except Exception:
-                continue
+                pass
 
-        # Correlations
-        num_cols = list(numeric_cols)
-        if len(num_cols) > 1:
+        # Correlations: only the upper triangle is read, positionally
+        if len(num_cols) > 1 and len(arr) > 1:
             try:
-                corr = data[num_cols].corr(numeric_only=True)
-                for i, c1 in enumerate(num_cols):
-                    for c2 in num_cols[i + 1 :]:
-                        val = float(corr.loc[c1, c2]) if not pd.isna(corr.loc[c1, c2]) else 0.0
-                        if abs(val) > 0.5:
-                            patterns["correlations"].append(
-                                {
-                                    "columns": [c1, c2],
-                                    "correlation": val,
-                                    "strength": "strong" if abs(val) > 0.7 else "moderate",
-                                }
-                            )
+                if np.isnan(arr).any():
+                    # pandas drops missing values per pair; corrcoef has no such mode
+                    corr = num.corr().to_numpy()
+                else:
+                    with np.errstate(divide="ignore", invalid="ignore"):  # constant columns -> NaN
+                        corr = np.corrcoef(arr, rowvar=False)
+                rows, cols = np.triu_indices(len(num_cols), k=1)
+                vals = np.nan_to_num(corr[rows, cols], nan=0.0)
+                for k in np.flatnonzero(np.abs(vals) > 0.5):
+                    val = float(vals[k])
+                    patterns["correlations"].append(
+                        {
+                            "columns": [num_cols[rows[k]], num_cols[cols[k]]],
+                            "correlation": val,
+                            "strength": "strong" if abs(val) > 0.7 else "moderate",
+                        }
+                    )
             except Exception:
                 pass
 
@@ -229,38 +364,45 @@ class InsightGenerator:
         try:
             # Identify datetime and numeric columns
             dt_cols = [c for c in data.columns if np.issubdtype(data[c].dtype, np.datetime64)]
+            parsed_t = None
             if not dt_cols:
                 # Try parseable date column
                 for c in data.columns:
                     if data[c].dtype == object:
+                        # Parse a sample first so text columns are rejected without a full-column parse
+                        sample = data[c].dropna().head(100)
+                        if not len(sample) or pd.to_datetime(sample, errors="coerce").notna().mean() <= 0.8:
+                            continue
                         parsed = pd.to_datetime(data[c], errors="coerce")
                         if parsed.notna().mean() > 0.8:
-                            data = data.copy()
-                            data[c] = parsed
+                            parsed_t = parsed
                             dt_cols = [c]
                             break
             num_cols = data.select_dtypes(include=[np.number]).columns.tolist()
             if dt_cols and num_cols:
                 t, y = dt_cols[0], num_cols[0]
-                s = data[[t, y]].dropna().sort_values(by=t)
+                # Two-column frame (parsed dates swapped in) rather than a copy of all of data
+                s = pd.DataFrame({t: data[t] if parsed_t is None else parsed_t, y: data[y]})
+                s = s.dropna().sort_values(by=t)
                 if len(s) >= 2:
-                    start_date, end_date = s[t].iloc[0], s[t].iloc[-1]
-                    start_val, end_val = float(s[y].iloc[0]), float(s[y].iloc[-1])
+                    dates = s[t]
+                    vals = s[y].to_numpy(dtype="float64")
+                    start_date, end_date = dates.iloc[0], dates.iloc[-1]
+                    start_val, end_val = float(vals[0]), float(vals[-1])
                     delta = end_val - start_val
                     pct = (delta / start_val * 100.0) if start_val else 0.0
                     insights.append(
                         f"From {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d}, {y} changed by {delta:.2f} ({pct:.2f}%)."
                     )
-                    # Extrema
-                    min_idx = int(s[y].idxmin())
-                    max_idx = int(s[y].idxmax())
-                    min_val, max_val = float(s[y].min()), float(s[y].max())
-                    min_date, max_date = s.loc[min_idx, t], s.loc[max_idx, t]
+                    # Extrema (positional, first occurrence like idxmin/idxmax)
+                    min_pos, max_pos = int(vals.argmin()), int(vals.argmax())
+                    min_val, max_val = float(vals[min_pos]), float(vals[max_pos])
+                    min_date, max_date = dates.iloc[min_pos], dates.iloc[max_pos]
                     insights.append(
                         f"Minimum {y} {min_val:.2f} on {min_date:%Y-%m-%d}; maximum {max_val:.2f} on {max_date:%Y-%m-%d}."
                     )
                     # Up/down counts
-                    deltas = s[y].diff().dropna()
+                    deltas = np.diff(vals)
                     up = int((deltas > 0).sum())
                     down = int((deltas < 0).sum())
                     insights.append(f"Up days: {up}, down days: {down} (net {(up-down)}).")
@@ -13,7 +13,10 @@ Note: If these are not set or SDK is missing, the service will raise at runtime.
 Callers should catch and fallback to deterministic logic.
 """
 from __future__ import annotations
+from collections import OrderedDict
+import hashlib
 import os
+import threading
 import time
 from typing import Optional
 
@@ -23,6 +26,17 @@ try:
 except Exception:
     resolve_foundry = None  # type: ignore
 
+# Run polling: seconds before the first status check, growing 1.5x per check up to the max
+_POLL_FIRST_DELAY = 0.1
+_POLL_MAX_DELAY = 1.0
+_TERMINAL_RUN_STATUSES = ("completed", "failed", "canceled", "expired")
+
+# Process-wide LRU of completed responses keyed on endpoint + agent + prompt digest. Services
+# are built per request, so identical prompts (same stats for the same dataset) skip the run.
+_COMPLETION_CACHE: "OrderedDict[tuple, str]" = OrderedDict()
+_COMPLETION_CACHE_MAX = 256
+_COMPLETION_CACHE_LOCK = threading.Lock()
+
 
 class FoundryService:
     def __init__(self,
@@ -70,11 +84,29 @@ class FoundryService:
     def complete(self, prompt: str, timeout_seconds: int = 45) -> str:
         """
         Send a single prompt to the Foundry agent and return the response text.
-        Creates a transient thread for this request.
+        Creates a transient thread for this request; repeated prompts are served from cache.
         """
         if not prompt or not prompt.strip():
             raise ValueError("prompt is required")
 
+        digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+        cache_key = (self.endpoint, self.agent_id, digest)
+        with _COMPLETION_CACHE_LOCK:
+            cached = _COMPLETION_CACHE.get(cache_key)
+            if cached is not None:
+                _COMPLETION_CACHE.move_to_end(cache_key)
+                return cached
+
+        text = self._run(prompt, timeout_seconds)
+        with _COMPLETION_CACHE_LOCK:
+            _COMPLETION_CACHE[cache_key] = text
+            _COMPLETION_CACHE.move_to_end(cache_key)
+            while len(_COMPLETION_CACHE) > _COMPLETION_CACHE_MAX:
+                _COMPLETION_CACHE.popitem(last=False)
+        return text
+
+    def _run(self, prompt: str, timeout_seconds: int) -> str:
+        """Run the agent on a transient thread and return its reply text (uncached)."""
         client = self._client_or_create()
 
         # Create thread
@@ -97,13 +129,17 @@ class FoundryService:
         if not run_id:
             raise RuntimeError("Failed to start Foundry run")
 
-        # Poll until completed
-        start = time.time()
+        # Poll until completed: short first waits so quick runs return promptly, backing off
+        # to _POLL_MAX_DELAY for long ones
+        deadline = time.monotonic() + timeout_seconds
+        delay = _POLL_FIRST_DELAY
         status = getattr(run, "status", None)
-        while status not in ("completed", "failed", "canceled"):
-            if time.time() - start > timeout_seconds:
+        while status not in _TERMINAL_RUN_STATUSES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 raise RuntimeError("Foundry run timed out")
-            time.sleep(0.75)
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 1.5, _POLL_MAX_DELAY)
             run = client.runs.get(thread_id=thread_id, run_id=run_id)
             status = getattr(run, "status", None)
 
@@ -25,23 +25,26 @@ def deduplicate_and_format_sources(
     # Deduplicate by URL
     unique_sources = {}
     for source in sources_list:
-        if source.get('url') not in unique_sources:
-            unique_sources[source.get('url')] = source
+        url = source.get('url')
+        if url not in unique_sources:
+            unique_sources[url] = source
     
-    # Format output
-    formatted_text = "Sources:\n\n"
-    for i, source in enumerate(unique_sources.values(), 1):
-        formatted_text += f"Source: {source.get('title','Untitled')}\n===\n"
-        formatted_text += f"URL: {source.get('url','')}\n===\n"
-        formatted_text += f"Most relevant content from source: {source.get('content','')}\n===\n"
+    # Format output: collect fragments and join once instead of repeated +=
+    parts = ["Sources:\n\n"]
+    for source in unique_sources.values():
+        parts.append(
+            f"Source: {source.get('title','Untitled')}\n===\n"
+            f"URL: {source.get('url','')}\n===\n"
+            f"Most relevant content from source: {source.get('content','')}\n===\n"
+        )
         if fetch_full_page:
             char_limit = max_tokens_per_source * 4
             raw_content = source.get('raw_content', '') or ''
             if len(raw_content) > char_limit:
                 raw_content = raw_content[:char_limit] + "... [truncated]"
-            formatted_text += f"Full source content limited to {max_tokens_per_source} tokens: {raw_content}\n\n"
-                
-    return formatted_text.strip()
+            parts.append(f"Full source content limited to {max_tokens_per_source} tokens: {raw_content}\n\n")
+
+    return "".join(parts).strip()
 
 def format_sources(search_results: Dict[str, Any]) -> str:
     """
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_attachment'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attachment',
+            index=models.Index(fields=['message', 'created_at'], name='api_attachm_message_46fde7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['thread', 'created_at'], name='api_chatmes_thread__6ccfd2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatthread',
+            index=models.Index(fields=['created_at'], name='api_chatthr_created_1ce8f9_idx'),
+        ),
+    ]
@@ -17,12 +17,19 @@ class ChatThread(models.Model):
     user_id = models.CharField(max_length=120, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["created_at"])]  # recent-threads listing
+
 class ChatMessage(models.Model):
     thread = models.ForeignKey(ChatThread, on_delete=models.CASCADE, related_name="messages")
     role = models.CharField(max_length=20)  # "system" | "user" | "assistant"
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # history/last-message lookups: a thread's messages ordered by time
+        indexes = [models.Index(fields=["thread", "created_at"])]
+
 
 class ChatFoundryThread(models.Model):
     """Persistent mapping from our ChatThread.id -> Foundry thread id (string).
@@ -42,5 +49,8 @@ class Attachment(models.Model):
     foundry_file_id = models.CharField(max_length=200, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["message", "created_at"])]
+
     def __str__(self) -> str:
         return f"Attachment({self.filename})"
@@ -3,10 +3,15 @@ Configuration and defaults for the Reasoning feature.
 These are intentionally simple and local to the Django backend.
 """
 from dataclasses import dataclass, field
-from typing import Dict, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import FrozenSet, Mapping
 
+# Trivial queries that skip the plan preview (compared case-folded)
+_SKIP_PLAN_KEYWORDS = frozenset({"hi", "hello", "thanks", "ok", "yes", "no"})
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ReasoningConfig:
     # Toggle: attempt LLM-backed reasoning if Azure env is configured; else fallback
     use_llm: bool = True
@@ -37,7 +42,7 @@ class ReasoningConfig:
     min_query_len_for_plan: int = 10
 
     # Skip plan when the query matches these trivial words
-    skip_plan_keywords: List[str] = field(default_factory=lambda: ["hi", "hello", "thanks", "ok", "yes", "no"])
+    skip_plan_keywords: FrozenSet[str] = _SKIP_PLAN_KEYWORDS
 
     # Max bullets in plan
     plan_max_bullets: int = 3
@@ -57,12 +62,14 @@ class ReasoningConfig:
     )
 
     # Domain-specific plan nudge prompts (optional)
-    plan_domain_prompts: Dict[str, str] = field(default_factory=lambda: {
+    plan_domain_prompts: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({
         "code": "Outline a short high-level approach to solve the coding task (e.g., key functions, main steps).",
         "data": "Outline a short high-level analysis plan (e.g., explore, model, evaluate).",
         "creative": "Outline a short structure/approach for the creative request (e.g., tone, sections).",
-    })
+    }))
 
 
+@lru_cache(maxsize=1)
 def get_default_config() -> ReasoningConfig:
+    # Immutable, so one shared instance serves every request
     return ReasoningConfig()
@@ -1,9 +1,19 @@
 import asyncio
+import hashlib
+import json
 import os
+from functools import lru_cache
 from typing import Awaitable, Callable, Dict, Optional, Tuple
 
+from django.core.cache import cache
+
 from .config import get_default_config
 
+try:
+    from ..analytics.services.foundry_service import FoundryService  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    FoundryService = None  # type: ignore
+
 NotifyFn = Callable[[Dict], Awaitable[None]]
 
 
@@ -11,11 +21,32 @@ def _env(name: str, default: str = "") -> str:
     return os.environ.get(name, default).strip()
 
 
+@lru_cache(maxsize=16)
+def _foundry_service(model_deployment: Optional[str], mode: str):
+    """Shared FoundryService per deployment/mode, so its Agents client and credential are reused.
+
+    Only the blocking Foundry client is cached: run_reasoning runs on a fresh event loop per
+    request, and an async LangChain client would keep connections bound to a closed loop.
+    """
+    if FoundryService is None:
+        raise RuntimeError("FoundryService unavailable")
+    return FoundryService(model_deployment=model_deployment, mode=mode)
+
+
 def _strip_thinking_tokens(text: str) -> str:
     # Hide potential model thinking tags
     return text.replace("<think>", "").replace("</think>", "").strip()
 
 
+# LLM reasoning replies, in Django's cache so they're shared across workers when it's Redis/Memcached
+_RESULT_CACHE_TIMEOUT = 60 * 60  # 1h
+
+
+def _result_cache_key(cfg, query: str, provider: Optional[str], model_deployment: Optional[str], mode: Optional[str]) -> str:
+    raw = json.dumps([query, cfg.system_prompt, (provider or "").lower(), model_deployment, mode, cfg.max_output_tokens])
+    return "reasoning:" + hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
 # ----------------------- Lightweight plan generation -----------------------
 _plan_cache: Dict[str, str] = {}
 _PLAN_CACHE_MAX = 128
@@ -68,10 +99,8 @@ def _make_plan_prompt(cfg, query: str) -> Tuple[str, str]:
 
 async def _call_foundry_plan(cfg, query: str, *, model_deployment: Optional[str], mode: Optional[str]) -> Optional[str]:
     try:
-        from ..analytics.services.foundry_service import FoundryService  # type: ignore
-
         def _run() -> str:
-            svc = FoundryService(model_deployment=model_deployment, mode=(mode or "work"))
+            svc = _foundry_service(model_deployment, mode or "work")
             sys, user = _make_plan_prompt(cfg, query)
             prompt = f"[SYSTEM]\n{sys}\n\n[USER]\n{user}\n"
             return svc.complete(prompt)
@@ -143,11 +172,9 @@ async def _call_foundry_reasoning(system_prompt: str, query: str, max_tokens: in
     Returns None if unavailable or on error.
     """
     try:
-        # Import lazily and construct a blocking client; run in thread to avoid blocking loop
-        from ..analytics.services.foundry_service import FoundryService  # type: ignore
-
+        # Blocking client; run in thread to avoid blocking loop
         def _run() -> str:
-            svc = FoundryService(model_deployment=model_deployment, mode=(mode or "work"))
+            svc = _foundry_service(model_deployment, mode or "work")
             prompt = (
                 f"[SYSTEM]\n{system_prompt.strip()}\n\n"
                 f"[TASK]\nAnswer the user's question with clear, concise markdown. Max ~{max_tokens} tokens.\n\n"
@@ -155,7 +182,6 @@ async def _call_foundry_reasoning(system_prompt: str, query: str, max_tokens: in
             )
             return svc.complete(prompt)
 
-        import asyncio
         return await asyncio.to_thread(_run)
     except Exception:
         return None
@@ -174,8 +200,8 @@ async def run_reasoning(query: str, notify: NotifyFn, *, provider: Optional[str]
 
     # Optionally emit a brief, high-level plan (not chain-of-thought)
     if cfg.emit_thinking_plan and len(query.strip()) >= cfg.min_query_len_for_plan:
-        lower = query.strip().lower()
-        if not any(k == lower for k in cfg.skip_plan_keywords):
+        lower = query.strip().casefold()
+        if lower not in cfg.skip_plan_keywords:
             plan: Optional[str] = _plan_cache.get(lower)
             if plan is None and cfg.use_llm:
                 if (provider or "").lower() == "foundry":
@@ -240,15 +266,20 @@ async def run_reasoning(query: str, notify: NotifyFn, *, provider: Optional[str]
                 # Stream sanitized plan as the 'thinking' preview
                 await notify({"event": "thinking", "message": plan})
 
-    # Try LLM-backed reasoning if configured
+    # Try LLM-backed reasoning if configured (an identical earlier request is served from cache)
     markdown: Optional[str] = None
     if cfg.use_llm:
+        result_key = _result_cache_key(cfg, query, provider, model_deployment, mode)
+        markdown = cache.get(result_key)
+    if cfg.use_llm and not markdown:
         # If provider is explicitly Foundry, try that first using the selected deployment/mode
         if (provider or "").lower() == "foundry":
             markdown = await _call_foundry_reasoning(cfg.system_prompt, query, cfg.max_output_tokens, model_deployment=model_deployment, mode=mode)
         # Fallback to Azure Chat Completions env path
         if not markdown:
             markdown = await _call_azure_reasoning(cfg.system_prompt, query, cfg.max_output_tokens)
+        if markdown:
+            cache.set(result_key, markdown, timeout=_RESULT_CACHE_TIMEOUT)
 
     if not markdown:
         # Fallback deterministic content
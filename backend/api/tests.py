@@ -1,7 +1,20 @@
-from django.test import TestCase
+import asyncio
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APIClient
 
+from api.analytics.analytics_handler import AnalyticsHandler
+from api.analytics.chart_generator import ChartGenerator
+from api.analytics.insight_generator import calculate_statistics
+from api.analytics.services.foundry_service import FoundryService
+from api.analytics.sql_agent import SQLAgent
+from api.reasoning import reasoning
+
 
 class EDATopNTest(TestCase):
 	def setUp(self):
@@ -32,3 +45,134 @@ class EDATopNTest(TestCase):
 		charts = body.get("charts", {}).get("charts", [])
 		types = {c.get("type") for c in charts}
 		self.assertTrue({"bar", "pie"}.issubset(types))
+
+
+class EDAUploadTest(TestCase):
+	def test_csv_upload_in_memory_and_on_disk(self):
+		csv = b"date,sales\n2024-01-01,1\n2024-01-02,2\n2024-01-03,3\n"
+		# 0 forces Django to spool the upload to a temporary file
+		for max_memory in (2_621_440, 0):
+			with self.subTest(max_memory=max_memory), override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=max_memory):
+				upload = SimpleUploadedFile("data.csv", csv, content_type="text/csv")
+				res = APIClient().post("/api/eda/process/", {"file": upload}, format="multipart")
+				self.assertEqual(res.status_code, 200)
+				self.assertEqual(res.json()["charts"]["success"], True)
+
+
+class SQLIntentTest(SimpleTestCase):
+	def setUp(self):
+		self.handler = AnalyticsHandler()
+
+	def test_keywords_and_years(self):
+		self.assertTrue(self.handler._check_sql_needed("Show TOTAL sales per region"))
+		self.assertTrue(self.handler._check_sql_needed("sales in 2023"))
+		self.assertFalse(self.handler._check_sql_needed("make it pretty"))
+		self.assertFalse(self.handler._check_sql_needed(""))
+
+	def test_explicit_chart_types(self):
+		df = pd.DataFrame({"region": ["N", "S"], "sales": [1, 2]})
+		specs = self.handler._extract_explicit_chart_requests("Pie Chart and a bar graph of sales", df)
+		self.assertEqual([s["type"] for s in specs], ["bar", "pie"])
+		self.assertEqual(self.handler._extract_explicit_chart_requests("show me insights on sales", df), [])
+
+
+class LLMChartRecCacheTest(SimpleTestCase):
+	def test_identical_requests_hit_the_cache(self):
+		calls = []
+
+		class FakeFoundry:
+			endpoint = "https://example.test"
+			agent_id = "cache-test-agent"
+
+			def complete(self, prompt):
+				calls.append(prompt)
+				return '[{"type": "bar", "x": "region", "y": "sales"}]'
+
+		df = pd.DataFrame({"region": ["N", "S"], "sales": [1, 2]})
+		for _ in range(2):
+			handler = AnalyticsHandler(foundry=FakeFoundry())
+			specs = handler._try_llm_chart_recommendations(df, "cache test prompt", "foundry")
+			self.assertEqual(specs[0]["type"], "bar")
+		self.assertEqual(len(calls), 1)
+
+
+class ChartGeneratorTest(SimpleTestCase):
+	def test_list_of_y_columns_draws_one_trace_per_column(self):
+		df = pd.DataFrame({"d": [1, 2, 3], "v": [1.0, 2.0, 3.0], "w": [3.0, 2.0, 1.0]})
+		for ctype in ("line", "bar", "scatter", "area"):
+			fig = ChartGenerator().create_chart(ctype, df, x="d", y=["v", "w"])
+			self.assertEqual([tr["name"] for tr in fig["data"]], ["v", "w"], ctype)
+		fig = ChartGenerator().create_chart("line", df, x="d", y="v")
+		self.assertEqual(len(fig["data"]), 1)
+
+
+class StatisticsTest(SimpleTestCase):
+	def test_infinite_values_keep_the_median(self):
+		stats = calculate_statistics(pd.DataFrame({"a": [1.0, np.inf, 2.0], "b": [4.0, 5.0, 6.0]}))
+		self.assertEqual(stats["a"]["median"], 2.0)
+		self.assertEqual(stats["a"]["max"], np.inf)
+		self.assertEqual(stats["b"]["median"], 5.0)
+		self.assertEqual(stats["b"]["iqr"], 1.0)
+
+
+class SQLAgentTest(SimpleTestCase):
+	def test_table_loaded_once_per_frame(self):
+		agent = SQLAgent()
+		df = pd.DataFrame({"region": ["N", "S", "N"], "sales": [1, 2, 3], "notes": ["a", "b", "c"]})
+		self.assertFalse(agent.execute(df, "make it pretty")["success"])
+		self.assertIsNone(agent.connection)  # rejected prompt never builds the table
+		res = agent.execute(df, "SELECT region, SUM(sales) AS s FROM data_table GROUP BY region", assume_sql=True)
+		self.assertEqual(res["data"]["s"].tolist(), [4, 2])
+		self.assertEqual(agent._loaded_cols, {"region", "sales"})
+		conn = agent.connection
+		res = agent.execute(df, "SELECT MAX(sales) AS m FROM data_table", assume_sql=True)
+		self.assertEqual(res["data"]["m"].tolist(), [3])
+		self.assertIs(agent.connection, conn)
+		res = agent.execute(df, "SELECT * FROM data_table", assume_sql=True)
+		self.assertEqual(res["result_shape"], (3, 3))
+
+	def test_reposted_dataset_reuses_the_loaded_table(self):
+		query = "SELECT city, COUNT(*) AS n FROM data_table GROUP BY city"
+		first, second = SQLAgent(), SQLAgent()  # one agent per request
+		first.execute(pd.DataFrame({"city": ["reuse-a", "reuse-b"]}), query, assume_sql=True)
+		res = second.execute(pd.DataFrame({"city": ["reuse-a", "reuse-b"]}), query, assume_sql=True)
+		self.assertEqual(res["data"]["n"].tolist(), [1, 1])
+		self.assertIs(second.connection, first.connection)
+
+	def test_validate_query_rejects_writes_and_comments(self):
+		agent = SQLAgent()
+		self.assertTrue(agent._validate_query("SELECT backdrop, last_update FROM data_table"))
+		self.assertFalse(agent._validate_query("SELECT a FROM data_table;\nDROP\tTABLE data_table"))
+		self.assertFalse(agent._validate_query("select a from data_table -- note"))
+		self.assertFalse(agent._validate_query("SELECT a FROM data_table_backup"))
+
+
+class FoundryCompletionCacheTest(SimpleTestCase):
+	def test_repeated_prompt_skips_the_run(self):
+		runs = []
+		service = FoundryService.__new__(FoundryService)  # skip SDK/credential wiring
+		service.endpoint, service.agent_id = "https://example.test", "completion-cache-test"
+		service._run = lambda prompt, timeout_seconds: runs.append(prompt) or f"reply {len(runs)}"
+		self.assertEqual(service.complete("same prompt"), "reply 1")
+		self.assertEqual(service.complete("same prompt"), "reply 1")
+		self.assertEqual(service.complete("other prompt"), "reply 2")
+		self.assertEqual(runs, ["same prompt", "other prompt"])
+
+
+class ReasoningResultCacheTest(SimpleTestCase):
+	def test_repeated_query_skips_the_llm(self):
+		calls = []
+
+		async def fake_azure(prompt, query, max_tokens):
+			calls.append(query)
+			return f"answer {len(calls)}"
+
+		async def notify(payload):
+			pass
+
+		with mock.patch.object(reasoning, "_call_azure_reasoning", fake_azure), \
+				mock.patch.object(reasoning, "_call_azure_plan", mock.AsyncMock(return_value=None)):
+			first = asyncio.run(reasoning.run_reasoning("why is the reasoning cache test sky blue?", notify))
+			second = asyncio.run(reasoning.run_reasoning("why is the reasoning cache test sky blue?", notify))
+		self.assertEqual((first, second), ("answer 1", "answer 1"))
+		self.assertEqual(len(calls), 1)
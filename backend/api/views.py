@@ -6,7 +6,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from io import BytesIO
-from PyPDF2 import PdfReader
+from pypdf import PdfReader
 from docx import Document
 from pptx import Presentation
 
@@ -970,10 +970,20 @@ class ReasoningStreamAPI(APIView):
             while True:
                 try:
                     item = q.get(timeout=30)
-                    if item == b"__CLOSE__":
-                        break
-                    yield item
                 except Empty:
                     yield sse_format("ping", event="keepalive")
+                    continue
+                # Send frames that are already queued (e.g. fallback/finalize/done) as one write
+                batch = []
+                while item != b"__CLOSE__":
+                    batch.append(item)
+                    try:
+                        item = q.get_nowait()
+                    except Empty:
+                        break
+                if batch:
+                    yield b"".join(batch)
+                if item == b"__CLOSE__":
+                    break
 
         return sse_response(gen())
\ No newline at end of file
@@ -75,11 +75,12 @@ async def example_statistical_insights():
     
     # Generate random data for demonstration
     import numpy as np
+    rng = np.random.default_rng(0)  # seeded so repeated runs are reproducible
     
     data = pd.DataFrame({
-        "metric": np.random.randn(100) * 10 + 50,
-        "category": np.random.choice(["A", "B", "C"], 100),
-        "value": np.random.randint(1, 100, 100)
+        "metric": rng.standard_normal(100) * 10 + 50,
+        "category": rng.choice(["A", "B", "C"], 100),
+        "value": rng.integers(1, 100, 100)
     })
     
     handler = AnalyticsHandler()
@@ -98,6 +98,8 @@ class ChartGenerator:
     
     def _prepare_dataframe(self, data: Dict[str, Any]) -> pd.DataFrame:
         """Convert various data formats to DataFrame"""
+        if type(data) is pd.DataFrame:
+            return data
         if isinstance(data, pd.DataFrame):
             return data
         elif isinstance(data, dict):
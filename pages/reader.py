@@ -3,9 +3,6 @@ import streamlit as st
 import app.pages as pages
 import app.utils as utils
 import app.prompts as prompts
-from PyPDF2 import PdfReader
-from docx import Document
-from pptx import Presentation
 from io import BytesIO
 
 def render(key_prefix: str = "reader"):
@@ -50,17 +47,20 @@ def render(key_prefix: str = "reader"):
             data = uploaded_file.read()
 
             if ext == "pdf":
+                from pypdf import PdfReader
                 pdf_reader = PdfReader(BytesIO(data))
                 for page in pdf_reader.pages:
                     extracted_text += (page.extract_text() or "") + "\n"
 
             elif ext == "docx":
+                from docx import Document
                 doc = Document(BytesIO(data))
                 for paragraph in doc.paragraphs:
                     if paragraph.text.strip():
                         extracted_text += paragraph.text + "\n"
 
             elif ext == "pptx":
+                from pptx import Presentation
                 prs = Presentation(BytesIO(data))
                 for slide in prs.slides:
                     for shape in slide.shapes:
@@ -48,6 +48,7 @@ def render(key_prefix: str = "reader"):
                             item=selected_style_data["id"], 
                             partition_key=selected_style_data["style"]
                         )
+                        utils.query_styles.clear()
                         st.success(f"Style '{selected_style}' has been deleted successfully!")
                     except Exception as e:
                         st.error(f"An error occurred while deleting the style: {str(e)}")